@@ -4,106 +4,282 @@ from pkgutil import walk_packages, iter_modules
 import os.path
 
 from .requests.request import Request
-from .responses.response import Response
 from .responses.html_response import HtmlResponse
+from .asset_manifest import AssetManifest
 from .endpoints.endpoint import Endpoint
-from .exceptions import AmbiguousEndpoints, InvalidDirectory
+from .endpoints.lazy_endpoint import LazyEndpoint
+from .exceptions import InvalidDirectory, InvalidMountPrefix, UnknownDispatchStage
+from .manifest import Manifest, endpoint_entry, endpoint_class
+from .matches import PRECOMPRESSED_EXTENSIONS, StaticFileMatch, PageMatch, MethodNotAllowedMatch
+from .page_cache import PageCache
+from .page_index import PageIndex
+from .route_cache import RouteCache
+from .router import Router
+from .static_file_cache import StaticFileCache
+from .static_index import StaticIndex
 from .template_renderer import TemplateRenderer
 
 
+NOT_CACHED = object()
+DISPATCH_ORDER = ('static', 'pages', 'endpoints')
+
+
 class App(object):
 
-    def __init__(self):
+    def __init__(self, route_cache_size=0, static_refresh_interval=None, static_miss_ttl=1, static_cache_size=0,
+            pages_refresh_interval=None, page_cache=False, production=False,
+            template_cache_size=400, bytecode_cache=None, bytecode_cache_directory=None, fragment_cache=None,
+            dispatch_order=DISPATCH_ORDER, dispatch_prefixes=None):
         self.endpoints = []
         self.registered_endpoint_classes = set()
+        self._registered_endpoint_keys = set()
+        self.router = Router()
+        self.route_cache = RouteCache(route_cache_size)
         self.static_paths = []
-        self.template_renderer = TemplateRenderer()
+        self.static_index = StaticIndex(static_refresh_interval, miss_ttl=static_miss_ttl)
+        self.static_file_cache = StaticFileCache(static_cache_size)
+        self.assets = AssetManifest(self.static_index)
+        self.template_renderer = TemplateRenderer(
+            cache_size=template_cache_size,
+            auto_reload=not production,
+            bytecode_cache=bytecode_cache,
+            bytecode_cache_directory=bytecode_cache_directory,
+            fragment_cache=fragment_cache,
+        )
+        self.fragment_cache = self.template_renderer.fragment_cache
+        self.template_renderer.add_global('asset_url', self.assets.url)
+        self.page_index = PageIndex(pages_refresh_interval)
+        self.page_cache = PageCache(self.template_renderer, not production) if page_cache else None
+        self._static_version = self.static_index.version
+        self._pages_version = self.page_index.version
+        self.package_endpoint_entries = {}
+        self.mounted_apps = {}
+        self.host_apps = {}
+        self._mount_depth = 0
+        self._dispatch_stages = self._make_dispatch_stages(dispatch_order, dispatch_prefixes or {})
 
     def endpoint(self, endpoint_class):
-        if endpoint_class in self.registered_endpoint_classes:
+        key = (endpoint_class.__module__, endpoint_class.__qualname__)
+        if key in self._registered_endpoint_keys:
             return
-        endpoint = endpoint_class()
+        self._add_endpoint(endpoint_class())
+        self.registered_endpoint_classes.add(endpoint_class)
+        self._registered_endpoint_keys.add(key)
+
+    def _add_endpoint(self, endpoint):
         endpoint.template_renderer = self.template_renderer
+        endpoint.bind_handlers()
+        self.router.add(endpoint)
         self.endpoints.append(endpoint)
-        self.registered_endpoint_classes.add(endpoint_class)
+        self.route_cache.clear()
 
-    def static(self, path):
+    def static(self, path, prefix=None, index=True):
         if not os.path.isdir(path):
             raise InvalidDirectory(path)
         self.static_paths.append(path)
+        self.static_index.add_directory(path, prefix, index)
+        self._static_reloaded()
+
+    def reload_static(self):
+        self.static_index.reload()
+        self._static_reloaded()
+
+    def _static_reloaded(self):
+        self._static_version = self.static_index.version
+        self.static_file_cache.clear()
+        self.assets.clear()
+        if self.page_cache is not None:
+            self.page_cache.clear()
+        self.route_cache.clear()
 
     def pages(self, path):
         if not os.path.isdir(path):
             raise InvalidDirectory(path)
         self.template_renderer.add_directory(path)
+        self.page_index.add_directory(path)
+        self._pages_reloaded()
+
+    def reload_pages(self):
+        self.page_index.reload()
+        self._pages_reloaded()
+
+    def _pages_reloaded(self):
+        self._pages_version = self.page_index.version
+        if self.page_cache is not None:
+            self.page_cache.clear()
+        self.route_cache.clear()
 
-    def package(self, path):
-        self._register_package_endpoints(path)
+    def warmup(self):
+        return self.template_renderer.warmup()
+
+    def package(self, path, manifest=None, lazy=False):
+        entries = Manifest.load(manifest).endpoints(path) if manifest else None
+        if entries is None:
+            endpoint_classes = self._discover_package_endpoint_classes(path)
+            entries = [endpoint_entry(cls) for cls in endpoint_classes]
+            for cls in endpoint_classes:
+                self.endpoint(cls)
+        elif lazy:
+            for entry in entries:
+                self._lazy_endpoint(entry)
+        else:
+            for entry in entries:
+                self.endpoint(endpoint_class(entry))
+        self.package_endpoint_entries[path] = entries
         self.template_renderer.add_package(path)
+        self.route_cache.clear()
+
+    def _lazy_endpoint(self, entry):
+        key = (entry['module'], entry['class'])
+        if key in self._registered_endpoint_keys:
+            return
+        self._add_endpoint(LazyEndpoint(entry))
+        self._registered_endpoint_keys.add(key)
+
+    def save_manifest(self, path):
+        manifest = Manifest()
+        for package_path, entries in self.package_endpoint_entries.items():
+            manifest.add_package(package_path, entries)
+        manifest.save(path)
 
-    def _register_package_endpoints(self, package_path):
+    def _discover_package_endpoint_classes(self, package_path):
+        endpoint_classes = []
         package = import_module(package_path)
         for loader, module_path, is_package in walk_packages(package.__path__):
             module = import_module('.' + module_path, package_path)
             if is_package:
-                self._register_package_endpoints(module.__name__)
+                endpoint_classes.extend(self._discover_package_endpoint_classes(module.__name__))
             else:
                 classes = getmembers(module, isclass)
                 for class_name, cls in classes:
                     if issubclass(cls, Endpoint) and cls.__module__.startswith(package_path):
-                        self.endpoint(cls)
+                        endpoint_classes.append(cls)
+        return endpoint_classes
+
+    def mount(self, prefix, app):
+        prefix = '/' + prefix.strip('/')
+        if prefix == '/':
+            raise InvalidMountPrefix(prefix)
+        self.mounted_apps[prefix] = app
+        self._mount_depth = max(self._mount_depth, prefix.count('/'))
+
+    def host(self, host, app):
+        self.host_apps[host.lower()] = app
 
     def __call__(self, env, start_response):
+        app, env = self._mounted_app(env)
+        if app is not self:
+            return app(env, start_response)
         request = Request(env)
         response = self.handle_request(request)
         self._try_rendering_status_page(response)
-        return response.wsgi(start_response)
+        return response.wsgi(start_response, env)
 
     def handle_request(self, request):
-        response = self._try_response_for_static_file(request)
-        if response:
-            return response
-        response = self._try_response_from_page(request)
-        if response:
-            return response
-        response = self._try_response_from_an_endpoint(request)
-        if response:
-            return response
+        app, env = self._mounted_app(request.env)
+        if app is not self:
+            return app.handle_request(Request(env))
+        match = self._match_request(request)
+        if match:
+            return match.handle_request(request)
         return self._response_404()
 
-    def _try_response_for_static_file(self, request):
-        for base_path in self.static_paths:
-            path = os.path.join(base_path, request.path.lstrip('/'))
-            if os.path.isfile(path):
-                response = Response()
-                response.file(path)
-                return response
+    def _mounted_app(self, env):
+        if self.host_apps:
+            host = env.get('HTTP_HOST', '').split(':')[0].lower()
+            if host in self.host_apps:
+                return self.host_apps[host], env
+        if self.mounted_apps:
+            path = env.get('PATH_INFO', '')
+            segments = path.split('/', self._mount_depth + 1)[:self._mount_depth + 1]
+            for depth in range(len(segments), 1, -1):
+                prefix = '/'.join(segments[:depth])
+                if prefix in self.mounted_apps:
+                    return self.mounted_apps[prefix], self._mounted_env(env, prefix)
+        return self, env
+
+    def _mounted_env(self, env, prefix):
+        env = dict(env)
+        env['SCRIPT_NAME'] = env.get('SCRIPT_NAME', '') + prefix
+        env['PATH_INFO'] = env['PATH_INFO'][len(prefix):] or '/'
+        return env
+
+    def _match_request(self, request):
+        self._refresh_indexes()
+        key = (request.method, request.path)
+        match = self.route_cache.get(key, NOT_CACHED)
+        if match is NOT_CACHED:
+            match = self._find_match(request)
+            if not (isinstance(match, StaticFileMatch) and match.fingerprinted):
+                self.route_cache.set(key, match)
+        return match
+
+    def _refresh_indexes(self):
+        self.static_index.refresh()
+        if self.static_index.version != self._static_version:
+            self._static_reloaded()
+        self.page_index.refresh()
+        if self.page_index.version != self._pages_version:
+            self._pages_reloaded()
+
+    def _make_dispatch_stages(self, order, prefixes):
+        matchers = {
+            'static': self._match_static_file,
+            'pages': self._match_page,
+            'endpoints': self._match_endpoint,
+        }
+        for stage in list(order) + list(prefixes):
+            if stage not in matchers:
+                raise UnknownDispatchStage(stage)
+        stages = []
+        for stage in order:
+            stage_prefixes = prefixes.get(stage)
+            if stage_prefixes is not None:
+                stage_prefixes = ['/' + prefix.strip('/') for prefix in stage_prefixes]
+                stage_prefixes = (set(stage_prefixes), tuple(prefix.rstrip('/') + '/' for prefix in stage_prefixes))
+            stages.append((matchers[stage], stage_prefixes))
+        return stages
+
+    def _find_match(self, request):
+        path = request.path
+        for match_stage, prefixes in self._dispatch_stages:
+            if prefixes is not None and path not in prefixes[0] and not path.startswith(prefixes[1]):
+                continue
+            match = match_stage(request)
+            if match:
+                return match
         return None
 
-    def _try_response_from_page(self, request):
-        page = request.path.strip('/')
-        if os.path.basename(page) == 'index':
-            return None # index pages should not be referenced explicitly
-        regular_template_path = page + '.html' if page else None
-        index_template_path = (page + '/index.html').strip('/')
-        for template_path in (regular_template_path, index_template_path):
-            if template_path and self.template_renderer.has_page(template_path):
-                response = Response()
-                response.headers['Content-Type'] = 'text/html; charset=utf-8'
-                response.body = self.template_renderer.render(template_path)
-                return response
+    def _match_static_file(self, request):
+        url_path = request.path
+        path = self.static_index.find(url_path)
+        fingerprinted = False
+        if not path:
+            url_path = self.assets.resolve(request.path)
+            if not url_path:
+                return None
+            path = self.static_index.find(url_path)
+            fingerprinted = True
+        encoded_paths = {}
+        for encoding, extension in PRECOMPRESSED_EXTENSIONS:
+            if self.static_index.find(url_path + extension) == path + extension:
+                encoded_paths[encoding] = path + extension
+        return StaticFileMatch(path, self.static_file_cache, encoded_paths, fingerprinted)
+
+    def _match_page(self, request):
+        template_path = self.page_index.find(request.path)
+        if template_path:
+            return PageMatch(self.template_renderer, template_path, self.page_cache)
         return None
 
-    def _try_response_from_an_endpoint(self, request):
-        matched_endpoints = []
-        for endpoint in self.endpoints:
-            if endpoint.match_request(request):
-                matched_endpoints.append(endpoint)
-        if len(matched_endpoints) > 1:
-            raise AmbiguousEndpoints(request)
-        elif matched_endpoints:
-            endpoint = matched_endpoints.pop()
-            return endpoint.handle_request(request)
+    def _match_endpoint(self, request):
+        match = self.router.match(request)
+        if match:
+            return match
+        allowed_methods = self.router.allowed_methods(request)
+        if allowed_methods:
+            allowed_methods = [method for method in Endpoint._allowed_methods if method in allowed_methods]
+            return MethodNotAllowedMatch(allowed_methods)
         return None
 
     def _response_404(self):
@@ -112,7 +288,7 @@ class App(object):
         return response
 
     def _try_rendering_status_page(self, response):
-        if isinstance(response, HtmlResponse) and not response.body:
+        if isinstance(response, HtmlResponse) and not response.body and not response.is_streaming:
             template_path = str(response.status) + '.html'
             if self.template_renderer.has_page(template_path):
                 response.body = self.template_renderer.render(template_path)
@@ -0,0 +1,68 @@
+from hashlib import md5
+import os
+import re
+
+
+FINGERPRINT_LENGTH = 8
+FINGERPRINTED_PATH = re.compile(r'^(.*/[^/]*?)\.([0-9a-f]{%d})(\.[^./]*)?$' % FINGERPRINT_LENGTH)
+
+
+class AssetManifest(object):
+
+    def __init__(self, static_index):
+        self.static_index = static_index
+        self._fingerprints = {}
+
+    def url(self, path):
+        path = '/' + path.lstrip('/')
+        file_path = self.static_index.find(path)
+        fingerprint = self._fingerprint(file_path) if file_path is not None else None
+        if fingerprint is None:
+            return path
+        base, extension = self._split_extension(path)
+        return '{}.{}{}'.format(base, fingerprint, extension)
+
+    def urls(self):
+        urls = {}
+        for directory in self.static_index.directories:
+            for relative_path in directory.files:
+                path = directory.prefix.rstrip('/') + '/' + relative_path
+                urls.setdefault(path.lstrip('/'), self.url(path).lstrip('/'))
+        return urls
+
+    def resolve(self, url_path):
+        match = FINGERPRINTED_PATH.match(url_path)
+        if not match:
+            return None
+        path = match.group(1) + (match.group(3) or '')
+        file_path = self.static_index.find(path)
+        if file_path is None or self._fingerprint(file_path) != match.group(2):
+            return None
+        return path
+
+    def clear(self):
+        self._fingerprints.clear()
+
+    def _fingerprint(self, file_path):
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        version = (stat.st_mtime, stat.st_size)
+        cached = self._fingerprints.get(file_path)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        digest = md5()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(64 * 1024), b''):
+                digest.update(chunk)
+        fingerprint = digest.hexdigest()[:FINGERPRINT_LENGTH]
+        self._fingerprints[file_path] = (version, fingerprint)
+        return fingerprint
+
+    def _split_extension(self, path):
+        directory, _, filename = path.rpartition('/')
+        name, dot, extension = filename.rpartition('.')
+        if not dot or not name:
+            return path, ''
+        return directory + '/' + name, '.' + extension
@@ -0,0 +1,41 @@
+import re
+import uuid
+
+from .exceptions import UnknownConverter
+
+
+class Converter(object):
+
+    def __init__(self, name, regex, to_python):
+        self.name = name
+        self.regex = regex
+        self.to_python = to_python
+        self._compiled_regex = re.compile(regex)
+
+    def match(self, segment):
+        return self._compiled_regex.fullmatch(segment) is not None
+
+    def overlaps(self, other):
+        return frozenset((self.name, other.name)) not in DISJOINT_CONVERTERS
+
+
+CONVERTERS = {
+    'str': Converter('str', r'[^\/]+', str),
+    'int': Converter('int', r'[0-9]+', int),
+    'slug': Converter('slug', r'[-a-zA-Z0-9_]+', str),
+    'uuid': Converter('uuid', r'[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}', uuid.UUID),
+}
+
+DISJOINT_CONVERTERS = {
+    frozenset(('int', 'uuid')),
+}
+
+
+def parse_param(param):
+    match = re.match(r'^([^<>]+)<([^<>]+)>$', param)
+    if match is None:
+        return param, CONVERTERS['str']
+    name, converter_name = match.groups()
+    if converter_name not in CONVERTERS:
+        raise UnknownConverter(converter_name)
+    return name, CONVERTERS[converter_name]
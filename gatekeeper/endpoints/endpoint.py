@@ -1,5 +1,6 @@
 import re
 
+from ..converters import parse_param
 from ..responses.response import Response
 from ..exceptions import TemplateRendererNotSet
 
@@ -8,11 +9,39 @@ class Endpoint(object):
 
     path = None
     _allowed_methods = ('GET', 'POST', 'PUT', 'PATCH', 'DELETE', 'HEAD', 'OPTIONS')
+    _hook_names = ('before_request', 'after_request', 'on_exception')
 
     def __init__(self):
         self._compiled_regex = None
         self._compile_regex_if_needed()
         self.template_renderer = None
+        self._handlers = None
+        self._hooks = None
+
+    def bind_handlers(self):
+        self._handlers = {}
+        for method in self._allowed_methods:
+            handler = getattr(self, method.lower(), None)
+            if handler is not None:
+                self._handlers[method] = handler
+        self._hooks = {name: getattr(self, name, None) for name in self._hook_names}
+
+    def supported_methods(self):
+        if self._handlers is not None:
+            return tuple(self._handlers)
+        return tuple(method for method in self._allowed_methods if hasattr(self, method.lower()))
+
+    def _handler(self, method):
+        if self._handlers is not None:
+            return self._handlers.get(method)
+        if method in self._allowed_methods:
+            return getattr(self, method.lower(), None)
+        return None
+
+    def _hook(self, name):
+        if self._hooks is not None:
+            return self._hooks[name]
+        return getattr(self, name, None)
 
     def _compile_regex_if_needed(self):
         regex = self._path_regex()
@@ -38,7 +67,19 @@ class Endpoint(object):
         return self.path and self.path.startswith('^')
 
     def _simple_pattern_to_regex(self, pattern):
-        return '^' + re.sub(r'\/:([^\/]+)', r'/(?P<\1>[^\/]+)', self.path) + '$'
+        return '^' + re.sub(r'\/:([^\/]+)', self._param_to_regex, self.path) + '$'
+
+    def _param_to_regex(self, match):
+        name, converter = parse_param(match.group(1))
+        return '/(?P<{}>{})'.format(name, converter.regex)
+
+    def _path_converters(self):
+        converters = {}
+        if self._path_is_simple_pattern():
+            for param in re.findall(r'\/:([^\/]+)', self.path):
+                name, converter = parse_param(param)
+                converters[name] = converter
+        return converters
 
     def match_request(self, request):
         return self._url_match(request) and self._method_match(request)
@@ -49,21 +90,20 @@ class Endpoint(object):
         return request.path == self.path
 
     def _method_match(self, request):
-        is_allowed = request.method in self._allowed_methods
-        has_method = hasattr(self, request.method.lower())
-        return is_allowed and has_method
+        return self._handler(request.method) is not None
 
-    def handle_request(self, request):
-        self._fill_request_args(request)
+    def handle_request(self, request, args=None):
+        self._fill_request_args(request, args)
         response = self._make_response()
         self._set_response_template_renderer(response)
         return self._execute_life_cycle(request, response)
 
-    def _fill_request_args(self, request):
-        request.args = {}
-        if self._compiled_regex:
-            match = self._compiled_regex.match(request.path)
-            request.args = match.groupdict()
+    def _fill_request_args(self, request, args):
+        if args is None and self._compiled_regex:
+            args = self._compiled_regex.match(request.path).groupdict()
+            for name, converter in self._path_converters().items():
+                args[name] = converter.to_python(args[name])
+        request.args = args or {}
 
     def _make_response(self):
         return Response()
@@ -73,26 +113,29 @@ class Endpoint(object):
             response.template_renderer = self.template_renderer
 
     def _execute_life_cycle(self, request, response):
-        method = getattr(self, request.method.lower())
+        method = self._handler(request.method)
+        before_request = self._hook('before_request')
+        after_request = self._hook('after_request')
+        on_exception = self._hook('on_exception')
         try:
-            if hasattr(self, 'before_request'):
-                self.before_request(request, response)
-            if request.method in self._allowed_methods:
+            if before_request:
+                before_request(request, response)
+            if method:
                 method(request, response)
         except Response as raised_response:
             response = raised_response
         except Exception as e:
-            if hasattr(self, 'on_exception'):
-                self.on_exception(request, e)
+            if on_exception:
+                on_exception(request, e)
             raise
         try:
-            if hasattr(self, 'after_request'):
-                self.after_request(request, response)
+            if after_request:
+                after_request(request, response)
         except Response as raised_response:
             response = raised_response
         except Exception as e:
-            if hasattr(self, 'on_exception'):
-                self.on_exception(request, e)
+            if on_exception:
+                on_exception(request, e)
             raise
         return response
 
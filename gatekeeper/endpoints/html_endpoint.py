@@ -8,9 +8,9 @@ class HtmlEndpoint(Endpoint):
     def _make_response(self):
         return HtmlResponse()
 
-    def handle_request(self, request):
+    def handle_request(self, request, args=None):
         request = HtmlRequest(request.env)
-        return super(HtmlEndpoint, self).handle_request(request)
+        return super(HtmlEndpoint, self).handle_request(request, args)
 
     def _execute_life_cycle(self, request, response):
         request.response = response
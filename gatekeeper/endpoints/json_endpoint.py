@@ -10,6 +10,6 @@ class JsonEndpoint(Endpoint):
     def _make_response(self):
         return JsonResponse()
 
-    def handle_request(self, request):
+    def handle_request(self, request, args=None):
         request = JsonRequest(request.env)
-        return super(JsonEndpoint, self).handle_request(request)
+        return super(JsonEndpoint, self).handle_request(request, args)
@@ -0,0 +1,26 @@
+from .endpoint import Endpoint
+from ..manifest import endpoint_class
+
+
+class LazyEndpoint(Endpoint):
+
+    def __init__(self, entry):
+        self.entry = entry
+        self.path = entry['path']
+        self._endpoint = None
+        super(LazyEndpoint, self).__init__()
+
+    def supported_methods(self):
+        return tuple(self.entry['methods'])
+
+    @property
+    def endpoint(self):
+        if self._endpoint is None:
+            endpoint = endpoint_class(self.entry)()
+            endpoint.template_renderer = self.template_renderer
+            endpoint.bind_handlers()
+            self._endpoint = endpoint
+        return self._endpoint
+
+    def handle_request(self, request, args=None):
+        return self.endpoint.handle_request(request, args)
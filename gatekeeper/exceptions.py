@@ -21,9 +21,9 @@ class UploadTargetAlreadyExists(Exception):
 
 class AmbiguousEndpoints(Exception):
 
-    def __init__(self, request):
-        message = 'The same request is leading to different endpoints: '
-        message += request.method + ' ' + request.path
+    def __init__(self, method, path, other_path):
+        message = 'The same request can lead to different endpoints: '
+        message += '{} {} overlaps with {}'.format(method, path, other_path)
         super(AmbiguousEndpoints, self).__init__(message)
 
 
@@ -32,3 +32,31 @@ class InvalidDirectory(Exception):
     def __init__(self, path):
         message = 'Provided path is not a valid directory: ' + path
         super(InvalidDirectory, self).__init__(message)
+
+
+class UnknownConverter(Exception):
+
+    def __init__(self, name):
+        message = 'Unknown type for path parameter: ' + name
+        super(UnknownConverter, self).__init__(message)
+
+
+class InvalidMountPrefix(Exception):
+
+    def __init__(self, prefix):
+        message = 'Apps cannot be mounted on this prefix: ' + prefix
+        super(InvalidMountPrefix, self).__init__(message)
+
+
+class UnknownDispatchStage(Exception):
+
+    def __init__(self, stage):
+        message = 'Unknown dispatch stage: ' + stage
+        super(UnknownDispatchStage, self).__init__(message)
+
+
+class UnknownBytecodeCache(Exception):
+
+    def __init__(self, name):
+        message = 'Unknown bytecode cache: {}. Use "filesystem", "memory" or a jinja2 BytecodeCache'.format(name)
+        super(UnknownBytecodeCache, self).__init__(message)
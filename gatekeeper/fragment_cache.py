@@ -0,0 +1,107 @@
+from collections import OrderedDict
+from hashlib import md5
+from tempfile import NamedTemporaryFile
+from threading import Lock
+from time import time
+import json
+import os
+
+
+class FragmentCache(object):
+
+    def __init__(self, store=None):
+        self.store = store if store is not None else MemoryFragmentStore()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def hit_ratio(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def fetch(self, key, ttl, render):
+        key = str(key)
+        value = self.store.get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+        self.misses += 1
+        value = str(render())
+        self.store.set(key, value, ttl)
+        return value
+
+    def clear(self):
+        self.store.clear()
+
+
+class MemoryFragmentStore(object):
+
+    def __init__(self, size=1024):
+        self.size = size
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        with self._lock:
+            self._entries[key] = (value, time() + ttl if ttl else None)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class FileFragmentStore(object):
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry['expires_at'] is not None and entry['expires_at'] <= time():
+            self._remove(path)
+            return None
+        return entry['value']
+
+    def set(self, key, value, ttl=None):
+        entry = {'value': value, 'expires_at': time() + ttl if ttl else None}
+        with NamedTemporaryFile('w', dir=self.directory, suffix='.tmp', delete=False) as f:
+            json.dump(entry, f)
+        os.replace(f.name, self._path(key))
+
+    def clear(self):
+        for filename in os.listdir(self.directory):
+            if filename.endswith('.fragment'):
+                self._remove(os.path.join(self.directory, filename))
+
+    def _path(self, key):
+        return os.path.join(self.directory, md5(key.encode('utf-8')).hexdigest() + '.fragment')
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
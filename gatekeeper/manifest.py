@@ -0,0 +1,59 @@
+from importlib import import_module
+import json
+import os
+
+
+class Manifest(object):
+
+    def __init__(self, packages=None):
+        self.packages = packages or {}
+
+    @classmethod
+    def load(cls, path):
+        try:
+            with open(path) as f:
+                return cls(json.load(f)['packages'])
+        except (OSError, ValueError, KeyError):
+            return cls()
+
+    def save(self, path):
+        with open(path, 'w') as f:
+            json.dump({'packages': self.packages}, f, indent=2, sort_keys=True)
+
+    def add_package(self, package_path, endpoint_entries):
+        self.packages[package_path] = {
+            'files': package_files(package_path),
+            'endpoints': endpoint_entries,
+        }
+
+    def endpoints(self, package_path):
+        package = self.packages.get(package_path)
+        if package is None or package['files'] != package_files(package_path):
+            return None
+        return package['endpoints']
+
+
+def endpoint_entry(endpoint_class):
+    return {
+        'module': endpoint_class.__module__,
+        'class': endpoint_class.__name__,
+        'path': endpoint_class.path,
+        'methods': [method for method in endpoint_class._allowed_methods if hasattr(endpoint_class, method.lower())],
+    }
+
+
+def endpoint_class(entry):
+    module = import_module(entry['module'])
+    return getattr(module, entry['class'])
+
+
+def package_files(package_path):
+    files = {}
+    for directory in import_module(package_path).__path__:
+        for root, dirnames, filenames in os.walk(directory):
+            for filename in filenames:
+                if filename.endswith('.py'):
+                    path = os.path.join(root, filename)
+                    stat = os.stat(path)
+                    files[os.path.relpath(path, directory)] = [stat.st_mtime, stat.st_size]
+    return files
@@ -0,0 +1,123 @@
+from hashlib import md5
+import mimetypes
+import os.path
+
+from .responses.response import Response
+from .responses.html_response import HtmlResponse
+
+
+PRECOMPRESSED_EXTENSIONS = (('br', '.br'), ('gzip', '.gz'))
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+
+class StaticFileMatch(object):
+
+    def __init__(self, path, file_cache=None, encoded_paths=None, fingerprinted=False):
+        self.path = path
+        self.file_cache = file_cache
+        self.encoded_paths = encoded_paths or {}
+        self.fingerprinted = fingerprinted
+
+    def handle_request(self, request):
+        try:
+            response = self._negotiated_response(request)
+        except OSError:
+            return HtmlResponse().not_found()
+        if self.encoded_paths:
+            response.headers['Vary'] = 'Accept-Encoding'
+        if self.fingerprinted:
+            response.headers['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+        return response.conditional(request)
+
+    def _negotiated_response(self, request):
+        encoding = self._negotiate_encoding(request)
+        if encoding is not None:
+            try:
+                response = self._file_response(self.encoded_paths[encoding])
+            except OSError:
+                return self._file_response(self.path)
+            type, _ = mimetypes.guess_type(self.path)
+            response.headers['Content-Type'] = type or 'application/octet-stream'
+            response.headers['Content-Disposition'] = 'inline; filename="{}"'.format(os.path.basename(self.path))
+            response.headers['Content-Encoding'] = encoding
+            return response
+        return self._file_response(self.path)
+
+    def _file_response(self, path):
+        entry = self.file_cache.get(path) if self.file_cache is not None else None
+        if entry:
+            return entry.response()
+        response = Response()
+        response.file(path)
+        return response
+
+    def _negotiate_encoding(self, request):
+        if not self.encoded_paths:
+            return None
+        accepted = _accepted_encodings(request.headers.get('Accept-Encoding', ''))
+        chosen, chosen_quality = None, 0
+        for encoding, extension in PRECOMPRESSED_EXTENSIONS:
+            if encoding in self.encoded_paths:
+                quality = accepted.get(encoding, accepted.get('*', 0))
+                if quality > chosen_quality:
+                    chosen, chosen_quality = encoding, quality
+        return chosen
+
+
+class PageMatch(object):
+
+    def __init__(self, template_renderer, template_path, page_cache=None):
+        self.template_renderer = template_renderer
+        self.template_path = template_path
+        self.page_cache = page_cache
+
+    def handle_request(self, request):
+        from jinja2 import TemplateNotFound
+        try:
+            if self.page_cache is not None:
+                response = self.page_cache.response(self.template_path)
+            else:
+                response = page_response(self.template_renderer.render(self.template_path))
+        except TemplateNotFound as e:
+            if e.name != self.template_path:
+                raise
+            return HtmlResponse().not_found()
+        return response.conditional(request)
+
+
+class MethodNotAllowedMatch(object):
+
+    def __init__(self, allowed_methods):
+        self.allowed_methods = allowed_methods
+
+    def handle_request(self, request):
+        response = HtmlResponse()
+        response.status = 405
+        response.headers['Allow'] = ', '.join(self.allowed_methods)
+        return response
+
+
+def _accepted_encodings(header):
+    encodings = {}
+    for item in header.split(','):
+        coding, _, params = item.partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        name, _, value = params.strip().partition('=')
+        if name.strip() == 'q':
+            try:
+                quality = float(value)
+            except ValueError:
+                quality = 0
+        encodings[coding] = quality
+    return encodings
+
+
+def page_response(body):
+    response = Response()
+    response.headers['Content-Type'] = 'text/html; charset=utf-8'
+    response.body = body
+    response.headers['ETag'] = '"{}"'.format(md5(response.body).hexdigest())
+    return response
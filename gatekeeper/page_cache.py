@@ -0,0 +1,48 @@
+from .matches import page_response
+from .responses.response import Response
+
+
+class PageCache(object):
+
+    def __init__(self, template_renderer, check_templates=True):
+        self.template_renderer = template_renderer
+        self.check_templates = check_templates
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def response(self, template_path):
+        entry = self._entries.get(template_path)
+        if entry is not None and (not self.check_templates or entry.is_current()):
+            self.hits += 1
+            return entry.response()
+        self.misses += 1
+        self._entries.pop(template_path, None)
+        dependencies = self.template_renderer.dependencies(template_path) if self.check_templates else []
+        response = page_response(self.template_renderer.render(template_path))
+        if dependencies is not None:
+            self._entries[template_path] = PageEntry(response, dependencies)
+        return response
+
+    def clear(self):
+        self._entries.clear()
+
+
+class PageEntry(object):
+
+    def __init__(self, response, dependencies):
+        self.body = response.body
+        self.headers = response.headers.to_dict()
+        self.dependencies = dependencies
+
+    def is_current(self):
+        return all(uptodate() for uptodate in self.dependencies)
+
+    def response(self):
+        response = Response()
+        response.headers.update(self.headers)
+        response.body = self.body
+        return response
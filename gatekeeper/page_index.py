@@ -0,0 +1,48 @@
+from time import time
+import posixpath
+
+from .static_index import StaticDirectory
+
+
+class PageIndex(object):
+
+    def __init__(self, refresh_interval=None):
+        self.directories = []
+        self.pages = {}
+        self.refresh_interval = refresh_interval
+        self.version = 0
+        self._checked_at = 0
+
+    def add_directory(self, path):
+        self.directories.append(StaticDirectory(path))
+        self.reload()
+
+    def reload(self):
+        regular_pages = {}
+        index_pages = {}
+        for directory in reversed(self.directories):
+            directory.reload()
+            for template_path in directory.files:
+                if not template_path.endswith('.html'):
+                    continue
+                page = template_path[:-len('.html')]
+                if posixpath.basename(page) == 'index':
+                    index_pages[posixpath.dirname(page)] = template_path
+                elif page:
+                    regular_pages[page] = template_path
+        pages = index_pages
+        pages.update(regular_pages)
+        self.pages = {page: template_path for page, template_path in pages.items() if posixpath.basename(page) != 'index'}
+        self.version += 1
+        self._checked_at = time()
+
+    def find(self, path):
+        self.refresh()
+        return self.pages.get(path.strip('/'))
+
+    def refresh(self):
+        if self.refresh_interval is None or time() - self._checked_at < self.refresh_interval:
+            return
+        self._checked_at = time()
+        if any(directory.changed() for directory in self.directories):
+            self.reload()
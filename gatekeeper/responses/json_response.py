@@ -19,9 +19,9 @@ class JsonResponse(Response):
             self._body = json.dumps(self.json, cls=CustomJsonEncoder).encode('utf-8')
         return self._body
 
-    def wsgi(self, start_respose):
+    def wsgi(self, start_respose, env=None):
         self.freeze = True
-        return super(JsonResponse, self).wsgi(start_respose)
+        return super(JsonResponse, self).wsgi(start_respose, env)
 
 
 class CustomJsonEncoder(json.JSONEncoder):
@@ -1,11 +1,64 @@
 from datetime import datetime
+from email.utils import formatdate, parsedate_to_datetime
 from http.client import responses as STATUS_MESSAGES
 from http.cookies import SimpleCookie
+from uuid import uuid4
 import mimetypes
 import os
 
 from ..exceptions import TemplateRendererNotSet
 from ..case_insensitive_dict import CaseInsensitiveDict
+from ..template_renderer import STREAM_BUFFER_SIZE
+
+
+FILE_CHUNK_SIZE = 1024 ** 2
+MAX_RANGES = 16
+
+
+def file_etag(size, mtime):
+    return 'W/"{:x}-{:x}"'.format(size, int(mtime * 10 ** 6))
+
+
+def _weak_etag(etag):
+    return etag[2:] if etag.startswith('W/') else etag
+
+
+def _parse_ranges(range_header, length):
+    unit, separator, specs = range_header.partition('=')
+    if unit.strip() != 'bytes' or not separator:
+        return None
+    specs = specs.split(',')
+    if len(specs) > MAX_RANGES:
+        return None
+    ranges = []
+    for spec in specs:
+        start, separator, end = spec.strip().partition('-')
+        if not separator or not (start or end):
+            return None
+        if (start and not start.isdigit()) or (end and not end.isdigit()):
+            return None
+        if not start:
+            suffix = int(end)
+            if suffix > 0 and length > 0:
+                ranges.append((max(length - suffix, 0), length - 1))
+            continue
+        start = int(start)
+        end = int(end) if end else length - 1
+        if end < start:
+            return None
+        if start < length:
+            ranges.append((start, min(end, length - 1)))
+    return _merge_ranges(ranges)
+
+
+def _merge_ranges(ranges):
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
 
 
 class Response(BaseException):
@@ -16,6 +69,8 @@ class Response(BaseException):
         self.cookies = []
         self._body = b''
         self._file = None
+        self._file_parts = None
+        self._stream = None
         self.template_renderer = None
 
     def __str__(self):
@@ -46,6 +101,20 @@ class Response(BaseException):
         self.body = self.template_renderer.render(template_identifier, context)
         return self
 
+    def stream(self, template_identifier, context=None, buffer_size=STREAM_BUFFER_SIZE):
+        if self.template_renderer is None:
+            raise TemplateRendererNotSet()
+        self._stream = self.template_renderer.stream(template_identifier, context, buffer_size)
+        return self
+
+    @property
+    def is_streaming(self):
+        return self._stream is not None
+
+    @property
+    def is_file(self):
+        return self._file is not None
+
     def redirect(self, uri):
         self.status = 303
         self.headers['Location'] = uri
@@ -74,9 +143,89 @@ class Response(BaseException):
         self.headers['Content-Type'] = type or 'application/octet-stream'
         self.headers['Content-Disposition'] = 'attachment' if download else 'inline'
         self.headers['Content-Disposition'] += '; filename="{}"'.format(name or os.path.basename(path))
-        self.headers['Content-Length'] = str(os.stat(path).st_size)
+        stat = os.stat(path)
+        self.headers['Content-Length'] = str(stat.st_size)
+        self.headers['ETag'] = file_etag(stat.st_size, stat.st_mtime)
+        self.headers['Last-Modified'] = formatdate(stat.st_mtime, usegmt=True)
+        self.headers['Accept-Ranges'] = 'bytes'
         return self
 
+    def conditional(self, request):
+        if self.status == 200 and request.method in ('GET', 'HEAD') and self._client_is_current(request):
+            self.status = 304
+            self._body = b''
+            self._file = None
+            self._stream = None
+            self.headers.pop('Content-Length', None)
+        elif self._accepts_range(request):
+            self._apply_ranges(request.headers['Range'])
+        return self
+
+    def _client_is_current(self, request):
+        if_none_match = request.headers.get('If-None-Match')
+        if if_none_match is not None:
+            etag = self.headers.get('ETag')
+            if etag is None:
+                return False
+            etags = [tag.strip() for tag in if_none_match.split(',')]
+            return '*' in etags or _weak_etag(etag) in map(_weak_etag, etags)
+        if_modified_since = request.headers.get('If-Modified-Since')
+        last_modified = self.headers.get('Last-Modified')
+        if if_modified_since is None or last_modified is None:
+            return False
+        try:
+            return parsedate_to_datetime(last_modified) <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+
+    def _accepts_range(self, request):
+        if self.status != 200 or request.method != 'GET' or 'Range' not in request.headers:
+            return False
+        if self.headers.get('Accept-Ranges') != 'bytes':
+            return False
+        if_range = request.headers.get('If-Range')
+        if if_range is None:
+            return True
+        if if_range.startswith('W/'):
+            return False
+        if if_range.startswith('"'):
+            return self.headers.get('ETag') == if_range
+        return self.headers.get('Last-Modified') == if_range
+
+    def _apply_ranges(self, range_header):
+        length = int(self.headers['Content-Length']) if self._file else len(self.body)
+        ranges = _parse_ranges(range_header, length)
+        if ranges is None:
+            return
+        if not ranges:
+            self.status = 416
+            self.headers['Content-Range'] = 'bytes */{}'.format(length)
+            self.headers.pop('Content-Length', None)
+            self._body = b''
+            self._file = None
+            return
+        self.status = 206
+        if len(ranges) == 1:
+            start, end = ranges[0]
+            parts = [(b'', start, end)]
+            trailer = b''
+            self.headers['Content-Range'] = 'bytes {}-{}/{}'.format(start, end, length)
+        else:
+            boundary = uuid4().hex
+            parts = []
+            for index, (start, end) in enumerate(ranges):
+                head = '{}--{}\r\nContent-Type: {}\r\nContent-Range: bytes {}-{}/{}\r\n\r\n'.format(
+                    '\r\n' if index else '', boundary, self.headers['Content-Type'], start, end, length)
+                parts.append((head.encode('utf-8'), start, end))
+            trailer = '\r\n--{}--\r\n'.format(boundary).encode('utf-8')
+            self.headers['Content-Type'] = 'multipart/byteranges; boundary=' + boundary
+        self.headers['Content-Length'] = str(sum(len(head) + end - start + 1 for head, start, end in parts) + len(trailer))
+        if self._file:
+            self._file_parts = (parts, trailer)
+        else:
+            body = self.body
+            self._body = b''.join(head + body[start:end + 1] for head, start, end in parts) + trailer
+
     def set_cookie(self, key, value, expires=None, domain=None, path=None, secure=False, http_only=True, same_site=True):
         cookie = SimpleCookie({key: value}).get(key).OutputString()
         if expires:
@@ -101,10 +250,15 @@ class Response(BaseException):
             cookie += '; Path=' + path
         self.cookies.append(cookie)
 
-    def wsgi(self, start_respose):
+    def wsgi(self, start_respose, env=None):
         start_respose(self._wsgi_status(), self._wsgi_headers())
         if self._file:
+            file_wrapper = env.get('wsgi.file_wrapper') if env else None
+            if file_wrapper and self._file_parts is None:
+                return file_wrapper(open(self._file, 'rb'), FILE_CHUNK_SIZE)
             return self._wsgi_file()
+        if self._stream is not None:
+            return self._stream
         return self._wsgi_body()
 
     def _wsgi_status(self):
@@ -114,7 +268,7 @@ class Response(BaseException):
         headers = list(self.headers.items())
         for cookie in self.cookies:
             headers.append(('Set-Cookie', cookie))
-        if 'Content-Length' not in self.headers:
+        if 'Content-Length' not in self.headers and self.status != 304 and self._stream is None:
             length = str(len(self.body))
             headers.append(('Content-Length', length))
         return headers
@@ -123,10 +277,20 @@ class Response(BaseException):
         return (self.body,)
 
     def _wsgi_file(self):
+        parts, trailer = self._file_parts or ([(b'', 0, None)], b'')
         with open(self._file, 'rb') as f:
-            mbyte = 1024 ** 2
-            while True:
-                chunk = f.read(mbyte)
-                if not chunk:
-                    break
-                yield chunk
+            for head, start, end in parts:
+                if head:
+                    yield head
+                f.seek(start)
+                remaining = end - start + 1 if end is not None else None
+                while remaining is None or remaining > 0:
+                    size = FILE_CHUNK_SIZE if remaining is None else min(FILE_CHUNK_SIZE, remaining)
+                    chunk = f.read(size)
+                    if not chunk:
+                        break
+                    if remaining is not None:
+                        remaining -= len(chunk)
+                    yield chunk
+        if trailer:
+            yield trailer
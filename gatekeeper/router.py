@@ -0,0 +1,186 @@
+import re
+
+from .converters import parse_param
+from .exceptions import AmbiguousEndpoints
+
+
+class Router(object):
+
+    def __init__(self):
+        self.root = RouteNode()
+        self.regex_endpoints = {}
+
+    def add(self, endpoint):
+        if endpoint.path is None:
+            return
+        methods = endpoint.supported_methods()
+        if endpoint._path_is_regex():
+            self._check_regex_overlaps(endpoint, methods)
+            for method in methods:
+                self.regex_endpoints.setdefault(method, []).append(endpoint)
+            return
+        segments = self._path_segments(endpoint.path)
+        self._check_path_overlaps(endpoint, segments, methods)
+        node = self.root
+        params = []
+        for segment, param in segments:
+            if param:
+                name, converter = param
+                node = node.param_child(converter)
+                params.append(param)
+            else:
+                node = node.static_child(segment)
+        route = Route(endpoint, params)
+        for method in methods:
+            node.routes[method] = route
+
+    def _path_segments(self, path):
+        segments = []
+        for index, segment in enumerate(path.split('/')):
+            if index > 0 and segment.startswith(':') and len(segment) > 1:
+                segments.append((segment, parse_param(segment[1:])))
+            else:
+                segments.append((segment, None))
+        return segments
+
+    def _check_path_overlaps(self, endpoint, segments, methods):
+        for node in self._overlapping_nodes(self.root, segments, 0):
+            for method in methods:
+                if method in node.routes:
+                    raise AmbiguousEndpoints(method, endpoint.path, node.routes[method].endpoint.path)
+        if not any(param for segment, param in segments):
+            for method in methods:
+                for regex_endpoint in self.regex_endpoints.get(method, ()):
+                    if regex_endpoint._compiled_regex.match(endpoint.path):
+                        raise AmbiguousEndpoints(method, endpoint.path, regex_endpoint.path)
+
+    def _overlapping_nodes(self, node, segments, depth):
+        if depth == len(segments):
+            yield node
+            return
+        segment, param = segments[depth]
+        if param:
+            name, converter = param
+            children = [child for key, child in node.static_children.items() if converter.match(key)]
+            children.extend(child for child in node.param_children.values() if converter.overlaps(child.converter))
+        else:
+            children = [node.static_children[segment]] if segment in node.static_children else []
+            children.extend(child for child in node.param_children.values() if child.converter.match(segment))
+        for child in children:
+            yield from self._overlapping_nodes(child, segments, depth + 1)
+
+    def _check_regex_overlaps(self, endpoint, methods):
+        node = self.root
+        for segment in self._regex_literal_prefix(endpoint.path).split('/')[:-1]:
+            node = node.static_children.get(segment)
+            if node is None:
+                return
+        for exact_node in self._static_subtree(node):
+            for method in methods:
+                route = exact_node.routes.get(method)
+                if route is not None and endpoint._compiled_regex.match(route.endpoint.path):
+                    raise AmbiguousEndpoints(method, endpoint.path, route.endpoint.path)
+
+    def _static_subtree(self, node):
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(node.static_children.values())
+
+    def _regex_literal_prefix(self, regex):
+        if '|' in regex:
+            return ''
+        prefix = re.match(r'\^([^.^$*+?{}\[\]\\|()]*)', regex).group(1)
+        if regex[len(prefix) + 1:len(prefix) + 2] in ('?', '*', '{'):
+            prefix = prefix[:-1]
+        return prefix
+
+    def match(self, request):
+        method = request.method
+        for node, param_values in self._match_nodes(request):
+            route = node.routes.get(method)
+            if route is not None:
+                return RouteMatch(route.endpoint, route.args(param_values))
+        for endpoint in self.regex_endpoints.get(method, ()):
+            regex_match = endpoint._compiled_regex.match(request.path)
+            if regex_match:
+                return RouteMatch(endpoint, regex_match.groupdict())
+        return None
+
+    def allowed_methods(self, request):
+        methods = set()
+        for node, param_values in self._match_nodes(request):
+            methods.update(node.routes)
+        for method, endpoints in self.regex_endpoints.items():
+            if any(endpoint._url_match(request) for endpoint in endpoints):
+                methods.add(method)
+        return methods
+
+    def _match_nodes(self, request):
+        segments = request.path.split('/')
+        depth_count = len(segments)
+        stack = [(self.root, 0, ())]
+        while stack:
+            node, depth, param_values = stack.pop()
+            if depth == depth_count:
+                yield node, param_values
+                continue
+            segment = segments[depth]
+            for param_child in node.param_children.values():
+                if param_child.converter.match(segment):
+                    stack.append((param_child, depth + 1, param_values + (segment,)))
+            static_child = node.static_children.get(segment)
+            if static_child is not None:
+                stack.append((static_child, depth + 1, param_values))
+
+
+class RouteNode(object):
+
+    def __init__(self, converter=None):
+        self.converter = converter
+        self.static_children = {}
+        self.param_children = {}
+        self.routes = {}
+
+    def static_child(self, segment):
+        if segment not in self.static_children:
+            self.static_children[segment] = RouteNode()
+        return self.static_children[segment]
+
+    def param_child(self, converter):
+        if converter.name not in self.param_children:
+            self.param_children[converter.name] = RouteNode(converter)
+        return self.param_children[converter.name]
+
+
+class Route(object):
+
+    def __init__(self, endpoint, params):
+        self.endpoint = endpoint
+        self.params = params
+
+    def args(self, param_values):
+        args = {}
+        for (name, converter), value in zip(self.params, param_values):
+            args[name] = converter.to_python(value)
+        return args
+
+
+class RouteMatch(object):
+
+    def __init__(self, endpoint, args):
+        self.endpoint = endpoint
+        self.args = args
+
+    def __eq__(self, other):
+        return isinstance(other, RouteMatch) and (self.endpoint, self.args) == (other.endpoint, other.args)
+
+    def __repr__(self):
+        return '<RouteMatch:{}:{}>'.format(type(self.endpoint).__name__, self.args)
+
+    def handle_request(self, request):
+        response = self.endpoint.handle_request(request, dict(self.args))
+        if response.is_file:
+            response.conditional(request)
+        return response
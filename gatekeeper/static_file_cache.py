@@ -0,0 +1,107 @@
+from collections import OrderedDict
+from threading import Lock
+from time import time
+import os
+
+from .responses.response import Response
+
+
+class StaticFileCache(object):
+
+    def __init__(self, size=0, max_file_size=256 * 1024, check_interval=1):
+        self.size = size
+        self.max_file_size = max_file_size
+        self.check_interval = check_interval
+        self.hits = 0
+        self.misses = 0
+        self.resident_bytes = 0
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def hit_ratio(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def get(self, path):
+        if not self.size:
+            return None
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and self._is_fresh(entry):
+                self._entries.move_to_end(path)
+                self.hits += 1
+                return entry
+            if entry is not None:
+                self._remove(path)
+            self.misses += 1
+        entry = self._load(path)
+        if entry is not None:
+            with self._lock:
+                self._add(path, entry)
+        return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.resident_bytes = 0
+
+    def _is_fresh(self, entry):
+        now = time()
+        if now - entry.checked_at < self.check_interval:
+            return True
+        try:
+            stat = os.stat(entry.path)
+        except OSError:
+            return False
+        if (stat.st_mtime, stat.st_size) != (entry.mtime, len(entry.body)):
+            return False
+        entry.checked_at = now
+        return True
+
+    def _load(self, path):
+        try:
+            stat = os.stat(path)
+            if stat.st_size > min(self.max_file_size, self.size):
+                return None
+            with open(path, 'rb') as f:
+                body = f.read()
+        except OSError:
+            return None
+        return StaticFileEntry(path, body, stat.st_mtime)
+
+    def _add(self, path, entry):
+        if path in self._entries:
+            self._remove(path)
+        self._entries[path] = entry
+        self.resident_bytes += len(entry.body)
+        while self.resident_bytes > self.size:
+            path, evicted = self._entries.popitem(last=False)
+            self.resident_bytes -= len(evicted.body)
+
+    def _remove(self, path):
+        entry = self._entries.pop(path)
+        self.resident_bytes -= len(entry.body)
+
+
+class StaticFileEntry(object):
+
+    def __init__(self, path, body, mtime):
+        self.path = path
+        self.body = body
+        self.mtime = mtime
+        self.checked_at = time()
+        response = Response().file(path)
+        self.mimetype = response.headers['Content-Type']
+        self.etag = response.headers['ETag']
+        self.headers = response.headers.to_dict()
+        self.headers['Content-Length'] = str(len(body))
+
+    def response(self):
+        response = Response()
+        response.headers.update(self.headers)
+        response.body = self.body
+        return response
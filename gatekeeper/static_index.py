@@ -0,0 +1,132 @@
+from collections import OrderedDict
+from threading import Lock
+from time import time
+import os
+
+
+class StaticIndex(object):
+
+    def __init__(self, refresh_interval=None, miss_cache_size=1024, miss_ttl=1):
+        self.directories = []
+        self.refresh_interval = refresh_interval
+        self.misses = MissCache(miss_cache_size, miss_ttl)
+        self.version = 0
+        self._checked_at = 0
+
+    def add_directory(self, path, prefix=None, index=True):
+        self.directories.append(StaticDirectory(path, prefix, index))
+        self.reload()
+
+    def reload(self):
+        for directory in self.directories:
+            directory.reload()
+        self.misses.clear()
+        self.version += 1
+        self._checked_at = time()
+
+    def find(self, path):
+        self.refresh()
+        if self.misses.contains(path):
+            return None
+        filesystem_checked = False
+        for directory in self.directories:
+            relative_path = directory.relative_path(path)
+            if relative_path is None:
+                continue
+            file_path = directory.find(relative_path)
+            if file_path:
+                return file_path
+            filesystem_checked = filesystem_checked or not directory.indexed
+        if filesystem_checked:
+            self.misses.add(path)
+        return None
+
+    def refresh(self):
+        if self.refresh_interval is None or time() - self._checked_at < self.refresh_interval:
+            return
+        self._checked_at = time()
+        if any(directory.changed() for directory in self.directories):
+            self.reload()
+
+
+class StaticDirectory(object):
+
+    def __init__(self, path, prefix=None, indexed=True):
+        self.path = path
+        self.prefix = '/' + prefix.strip('/') if prefix else '/'
+        self.indexed = indexed
+        self.files = {}
+        self._root = os.path.join(os.path.normpath(path), '')
+        self._mtimes = {}
+
+    def relative_path(self, path):
+        if self.prefix == '/':
+            return path.lstrip('/')
+        if path.startswith(self.prefix + '/'):
+            return path[len(self.prefix) + 1:]
+        return None
+
+    def find(self, relative_path):
+        if self.indexed:
+            return self.files.get(relative_path)
+        file_path = os.path.normpath(os.path.join(self.path, relative_path))
+        if file_path.startswith(self._root) and os.path.isfile(file_path):
+            return file_path
+        return None
+
+    def reload(self):
+        if not self.indexed:
+            return
+        files = {}
+        mtimes = {}
+        for root, dirnames, filenames in os.walk(self.path, followlinks=True):
+            mtimes[root] = os.stat(root).st_mtime
+            for filename in filenames:
+                path = os.path.join(root, filename)
+                files[os.path.relpath(path, self.path).replace(os.sep, '/')] = path
+        self.files = files
+        self._mtimes = mtimes
+
+    def changed(self):
+        for directory, mtime in self._mtimes.items():
+            try:
+                if os.stat(directory).st_mtime != mtime:
+                    return True
+            except OSError:
+                return True
+        return False
+
+
+class MissCache(object):
+
+    def __init__(self, size=1024, ttl=1):
+        self.size = size
+        self.ttl = ttl
+        self._expirations = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._expirations)
+
+    def contains(self, key):
+        with self._lock:
+            expiration = self._expirations.get(key)
+            if expiration is None:
+                return False
+            if expiration <= time():
+                del self._expirations[key]
+                return False
+            return True
+
+    def add(self, key):
+        if not self.size or not self.ttl:
+            return
+        with self._lock:
+            self._expirations[key] = time() + self.ttl
+            self._expirations.move_to_end(key)
+            if len(self._expirations) > self.size:
+                self._expirations.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._expirations.clear()
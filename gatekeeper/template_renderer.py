@@ -1,11 +1,27 @@
+from collections import OrderedDict
+from threading import Lock
+from time import perf_counter
 import os.path
 
+from .exceptions import UnknownBytecodeCache
+from .fragment_cache import FragmentCache
+
+
+STREAM_BUFFER_SIZE = 8192
+
 
 class TemplateRenderer(object):
 
-    def __init__(self):
+    def __init__(self, cache_size=400, auto_reload=True, bytecode_cache=None, bytecode_cache_directory=None,
+            fragment_cache=None):
         self.directories = []
         self.packages = []
+        self.globals = {}
+        self.cache_size = cache_size
+        self.auto_reload = auto_reload
+        self.bytecode_cache = bytecode_cache
+        self.bytecode_cache_directory = bytecode_cache_directory
+        self.fragment_cache = fragment_cache if fragment_cache is not None else FragmentCache()
         self.jinja_env = None
 
     def add_directory(self, path):
@@ -14,6 +30,11 @@ class TemplateRenderer(object):
     def add_package(self, package):
         self.packages.append(package)
 
+    def add_global(self, name, value):
+        self.globals[name] = value
+        if self.jinja_env:
+            self.jinja_env.globals[name] = value
+
     def render(self, template_identifier, context=None):
         self._set_env_once()
         template = self.jinja_env.get_template(template_identifier)
@@ -21,6 +42,58 @@ class TemplateRenderer(object):
         context.pop('self', None)
         return template.render(**context)
 
+    def stream(self, template_identifier, context=None, buffer_size=STREAM_BUFFER_SIZE):
+        self._set_env_once()
+        template = self.jinja_env.get_template(template_identifier)
+        context = context or {}
+        context.pop('self', None)
+        return self._buffered_chunks(template.generate(**context), buffer_size)
+
+    def _buffered_chunks(self, texts, buffer_size):
+        buffer = []
+        buffered = 0
+        for text in texts:
+            chunk = text.encode('utf-8')
+            buffer.append(chunk)
+            buffered += len(chunk)
+            if buffered >= buffer_size:
+                yield b''.join(buffer)
+                buffer = []
+                buffered = 0
+        if buffer:
+            yield b''.join(buffer)
+
+    def warmup(self):
+        self._set_env_once()
+        compile_times = {}
+        for template_identifier in self.jinja_env.list_templates(extensions=['html']):
+            start = perf_counter()
+            self.jinja_env.get_template(template_identifier)
+            compile_times[template_identifier] = perf_counter() - start
+        return compile_times
+
+    def dependencies(self, template_identifier):
+        self._set_env_once()
+        from jinja2 import TemplateNotFound, meta
+        uptodates = {}
+        pending = [template_identifier]
+        while pending:
+            name = pending.pop()
+            if name in uptodates:
+                continue
+            try:
+                source, filename, uptodate = self.jinja_env.loader.get_source(self.jinja_env, name)
+            except TemplateNotFound:
+                return None
+            if uptodate is None:
+                return None
+            uptodates[name] = uptodate
+            for referenced_name in meta.find_referenced_templates(self.jinja_env.parse(source)):
+                if referenced_name is None:
+                    return None
+                pending.append(referenced_name)
+        return list(uptodates.values())
+
     def has_page(self, template_identifier):
         for directory in self.directories:
             full_path = os.path.join(directory, template_identifier)
@@ -32,9 +105,29 @@ class TemplateRenderer(object):
         if self.jinja_env:
             return
         from jinja2 import Environment, select_autoescape
+        from .fragment_cache_extension import FragmentCacheExtension
         loader = self._make_loader()
         autoescape = select_autoescape(default=True, default_for_string=True)
-        self.jinja_env = Environment(loader=loader, autoescape=autoescape)
+        self.jinja_env = Environment(
+            loader=loader,
+            autoescape=autoescape,
+            cache_size=self.cache_size,
+            auto_reload=self.auto_reload,
+            bytecode_cache=self._make_bytecode_cache(),
+            extensions=[FragmentCacheExtension],
+        )
+        self.jinja_env.fragment_cache = self.fragment_cache
+        self.jinja_env.globals.update(self.globals)
+
+    def _make_bytecode_cache(self):
+        from jinja2 import BytecodeCache, FileSystemBytecodeCache, MemcachedBytecodeCache
+        if self.bytecode_cache is None or isinstance(self.bytecode_cache, BytecodeCache):
+            return self.bytecode_cache
+        if self.bytecode_cache == 'filesystem':
+            return FileSystemBytecodeCache(self.bytecode_cache_directory)
+        if self.bytecode_cache == 'memory':
+            return MemcachedBytecodeCache(MemoryBytecodeStore())
+        raise UnknownBytecodeCache(self.bytecode_cache)
 
     def _make_loader(self):
         from jinja2 import ChoiceLoader, FileSystemLoader
@@ -48,3 +141,28 @@ class TemplateRenderer(object):
         for package in self.packages:
             prefix_map[package] = PackageLoader(package, 'templates')
         return PrefixLoader(prefix_map)
+
+
+class MemoryBytecodeStore(object):
+
+    def __init__(self, size=1000):
+        self.size = size
+        self._bytecodes = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._bytecodes)
+
+    def get(self, key):
+        with self._lock:
+            bytecode = self._bytecodes.get(key)
+            if bytecode is not None:
+                self._bytecodes.move_to_end(key)
+            return bytecode
+
+    def set(self, key, value, timeout=None):
+        with self._lock:
+            self._bytecodes[key] = value
+            self._bytecodes.move_to_end(key)
+            if len(self._bytecodes) > self.size:
+                self._bytecodes.popitem(last=False)
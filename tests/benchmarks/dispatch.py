@@ -0,0 +1,54 @@
+from argparse import ArgumentParser
+from itertools import permutations
+import sys
+from timeit import timeit
+
+from gatekeeper import App, Request
+from gatekeeper.app import DISPATCH_ORDER
+
+from .routing import STATIC_DIRECTORY, PAGES_DIRECTORY, make_endpoint_class, synthetic_path
+
+
+PATHS = {
+    'endpoint': '/exact0/items',
+    'static': '/robots.txt',
+    'page': '/about',
+    'miss': '/missing/path',
+}
+
+
+def make_app(size, dispatch_order, dispatch_prefixes=None):
+    app = App(dispatch_order=dispatch_order, dispatch_prefixes=dispatch_prefixes)
+    app.static(STATIC_DIRECTORY)
+    app.pages(PAGES_DIRECTORY)
+    for index in range(size):
+        app.endpoint(make_endpoint_class(synthetic_path(index)))
+    return app
+
+
+def configurations():
+    for order in permutations(DISPATCH_ORDER):
+        yield ' > '.join(order), order, None
+    prefixes = {'static': ['/robots.txt', '/css'], 'pages': ['/about', '/settings']}
+    yield 'endpoints > static > pages (prefixed)', ('endpoints', 'static', 'pages'), prefixes
+
+
+def main():
+    parser = ArgumentParser(description='Measure the per-request cost of each dispatch order.')
+    parser.add_argument('--size', type=int, default=100, help='number of synthetic endpoints')
+    parser.add_argument('--number', type=int, default=10000, help='requests per measurement')
+    args = parser.parse_args()
+    print('{:<40}'.format('dispatch order') + ''.join('{:>12}'.format(name) for name in PATHS))
+    for name, order, prefixes in configurations():
+        app = make_app(args.size, order, prefixes)
+        row = '{:<40}'.format(name)
+        for path in PATHS.values():
+            env = {'REQUEST_METHOD': 'GET', 'PATH_INFO': path}
+            seconds = timeit(lambda: app.handle_request(Request(env)), number=args.number)
+            row += '{:>10.2f}us'.format(seconds / args.number * 10 ** 6)
+        print(row)
+        sys.stdout.flush()
+
+
+if __name__ == '__main__':
+    main()
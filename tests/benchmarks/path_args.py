@@ -0,0 +1,45 @@
+from timeit import timeit
+
+from gatekeeper import App, Endpoint, Request
+
+
+def make_endpoint_class(index):
+    class DeleteUser(Endpoint):
+        path = '/users{}/:id/delete'.format(index)
+        def post(self, request, response):
+            pass
+    return DeleteUser
+
+
+def make_app(size):
+    app = App()
+    for index in range(size):
+        app.endpoint(make_endpoint_class(index))
+    return app
+
+
+def route_with_two_regex_matches(app, request):
+    matched_endpoints = [endpoint for endpoint in app.endpoints if endpoint.match_request(request)]
+    return matched_endpoints[0].handle_request(request)
+
+
+def route_with_single_pass(app, request):
+    return app.router.match(request).handle_request(request)
+
+
+def main(number=10000):
+    for size in (1, 10, 100):
+        app = make_app(size)
+        request = Request({'REQUEST_METHOD': 'POST', 'PATH_INFO': '/users{}/9/delete'.format(size - 1)})
+        two_regex_matches = timeit(lambda: route_with_two_regex_matches(app, request), number=number)
+        single_pass = timeit(lambda: route_with_single_pass(app, request), number=number)
+        print('{:>4} endpoints: {:8.2f}us -> {:8.2f}us per request ({:.1f}x)'.format(
+            size,
+            two_regex_matches / number * 10 ** 6,
+            single_pass / number * 10 ** 6,
+            two_regex_matches / single_pass,
+        ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+from argparse import ArgumentParser
+import json
+import platform
+import sys
+from time import perf_counter
+
+from gatekeeper import App, Endpoint, Request
+
+
+STATIC_DIRECTORY = 'tests/test_app/resources/static1'
+PAGES_DIRECTORY = 'tests/test_app/resources/pages1'
+
+
+def make_endpoint_class(endpoint_path):
+    class SyntheticEndpoint(Endpoint):
+        path = endpoint_path
+        def get(self, request, response):
+            pass
+    return SyntheticEndpoint
+
+
+def synthetic_path(index):
+    kind = index % 3
+    if kind == 0:
+        return '/exact{}/items'.format(index)
+    elif kind == 1:
+        return '/param{}/:id/items'.format(index)
+    return r'^/regex{}/(?P<id>[0-9]+)$'.format(index)
+
+
+def make_app(size):
+    app = App()
+    app.static(STATIC_DIRECTORY)
+    app.pages(PAGES_DIRECTORY)
+    for index in range(size):
+        app.endpoint(make_endpoint_class(synthetic_path(index)))
+    return app
+
+
+def scenarios(size):
+    last_exact = (size - 1) // 3 * 3
+    last_param = last_exact + 1 if last_exact + 1 < size else last_exact - 2
+    last_regex = last_exact + 2 if last_exact + 2 < size else last_exact - 1
+    return {
+        'hit_exact': '/exact{}/items'.format(last_exact),
+        'hit_param': '/param{}/9/items'.format(last_param),
+        'hit_regex': '/regex{}/9'.format(last_regex),
+        'miss': '/missing/path',
+        'static': '/robots.txt',
+        'page': '/about',
+    }
+
+
+def measure(app, path, requests):
+    env = {'REQUEST_METHOD': 'GET', 'PATH_INFO': path}
+    latencies = []
+    for i in range(requests):
+        start = perf_counter()
+        app.handle_request(Request(env))
+        latencies.append(perf_counter() - start)
+    latencies.sort()
+    total = sum(latencies)
+    return {
+        'requests': requests,
+        'throughput': requests / total,
+        'mean_us': total / requests * 10 ** 6,
+        'p50_us': percentile(latencies, 50) * 10 ** 6,
+        'p90_us': percentile(latencies, 90) * 10 ** 6,
+        'p99_us': percentile(latencies, 99) * 10 ** 6,
+    }
+
+
+def percentile(sorted_values, percent):
+    index = int(round((len(sorted_values) - 1) * percent / 100.0))
+    return sorted_values[index]
+
+
+def run(sizes, requests):
+    results = []
+    for size in sizes:
+        start = perf_counter()
+        app = make_app(size)
+        build_seconds = perf_counter() - start
+        for scenario, path in sorted(scenarios(size).items()):
+            result = {'endpoints': size, 'scenario': scenario, 'path': path, 'build_seconds': build_seconds}
+            result.update(measure(app, path, requests))
+            results.append(result)
+            print('{:>6} endpoints {:>10}: {:10.0f} req/s  p50 {:9.1f}us  p99 {:9.1f}us'.format(
+                size, scenario, result['throughput'], result['p50_us'], result['p99_us']), file=sys.stderr)
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results,
+    }
+
+
+def main():
+    parser = ArgumentParser(description='Measure routing through App.handle_request with synthetic route tables.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000, 10000])
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--output', help='file to write JSON results to (default: stdout)')
+    args = parser.parse_args()
+    report = run(args.sizes, args.requests)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
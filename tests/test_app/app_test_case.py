@@ -4,8 +4,10 @@ from unittest.mock import Mock
 
 class AppTestCase(TestCase):
 
-    def assert_call(self, app, method, path, expected_status=None, expected_headers=None, expected_body=None):
+    def assert_call(self, app, method, path, expected_status=None, expected_headers=None, expected_body=None, request_headers=None):
         env = {'REQUEST_METHOD': method, 'PATH_INFO': path}
+        for key, value in (request_headers or {}).items():
+            env['HTTP_' + key.upper().replace('-', '_')] = value
         start_response = Mock()
         body = b''.join(app(env, start_response))
         status = start_response.call_args[0][0]
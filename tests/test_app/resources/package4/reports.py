@@ -0,0 +1,9 @@
+from gatekeeper import Endpoint
+
+
+class Report(Endpoint):
+
+    path = '/reports/:id<int>'
+
+    def get(self, request, response):
+        response.body = 'report {}'.format(request.args['id'])
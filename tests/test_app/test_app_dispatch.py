@@ -0,0 +1,66 @@
+from unittest.mock import patch
+
+from .app_test_case import AppTestCase
+
+from gatekeeper import App, Endpoint
+from gatekeeper.exceptions import UnknownDispatchStage
+
+
+class About(Endpoint):
+    path = '/about'
+    def get(self, request, response):
+        response.body = 'about endpoint'
+
+
+class Robots(Endpoint):
+    path = '/robots.txt'
+    def get(self, request, response):
+        response.body = 'robots endpoint'
+
+
+class AppDispatchTestCase(AppTestCase):
+
+    def make_app(self, **kwargs):
+        app = App(**kwargs)
+        app.static('tests/test_app/resources/static1')
+        app.pages('tests/test_app/resources/pages1')
+        app.endpoint(About)
+        app.endpoint(Robots)
+        return app
+
+    def test_app_tries_static_files_then_pages_then_endpoints_by_default(self):
+        app = self.make_app()
+        self.assert_call(app, 'GET', '/robots.txt', '200 OK', None, b'User-agent: *\nDisallow: /\n')
+        self.assert_call(app, 'GET', '/about', '200 OK', None, b'<h1> about </h1>')
+
+    def test_app_follows_configured_dispatch_order(self):
+        app = self.make_app(dispatch_order=('endpoints', 'pages', 'static'))
+        self.assert_call(app, 'GET', '/robots.txt', '200 OK', None, b'robots endpoint')
+        self.assert_call(app, 'GET', '/about', '200 OK', None, b'about endpoint')
+        self.assert_call(app, 'GET', '/css/simple.css', '200 OK')
+
+    def test_app_skips_stages_left_out_of_dispatch_order(self):
+        app = self.make_app(dispatch_order=('endpoints',))
+        self.assert_call(app, 'GET', '/css/simple.css', '404 Not Found')
+        self.assert_call(app, 'GET', '/settings', '404 Not Found')
+
+    def test_app_only_tries_stage_for_paths_under_its_prefixes(self):
+        app = self.make_app(dispatch_prefixes={'static': ['/css'], 'pages': ['/settings/']})
+        self.assert_call(app, 'GET', '/css/simple.css', '200 OK')
+        self.assert_call(app, 'GET', '/robots.txt', '200 OK', None, b'robots endpoint')
+        self.assert_call(app, 'GET', '/settings', '200 OK', None, b'<h1> settings </h1>')
+        self.assert_call(app, 'GET', '/about', '200 OK', None, b'about endpoint')
+        self.assert_call(app, 'GET', '/settingsx', '404 Not Found')
+
+    def test_app_does_not_look_into_stages_outside_their_prefixes(self):
+        app = self.make_app(dispatch_prefixes={'static': ['/assets'], 'pages': ['/docs']})
+        with patch.object(app.static_index, 'find') as find, patch.object(app.template_renderer, 'has_page') as has_page:
+            self.assert_call(app, 'GET', '/about', '200 OK', None, b'about endpoint')
+        self.assertFalse(find.called)
+        self.assertFalse(has_page.called)
+
+    def test_app_rejects_unknown_dispatch_stages(self):
+        with self.assertRaises(UnknownDispatchStage):
+            App(dispatch_order=('static', 'templates'))
+        with self.assertRaises(UnknownDispatchStage):
+            App(dispatch_prefixes={'templates': ['/docs']})
@@ -1,8 +1,9 @@
 from unittest.mock import Mock
+from wsgiref.util import FileWrapper
 
 from .app_test_case import AppTestCase
 
-from gatekeeper import App, Endpoint
+from gatekeeper import App, Endpoint, JsonEndpoint, Response
 from gatekeeper.template_renderer import TemplateRenderer
 from gatekeeper.exceptions import AmbiguousEndpoints
 
@@ -54,7 +55,23 @@ class AppEndpointTestCase(AppTestCase):
         app.endpoint(Hello2)
         self.assert_call(app, 'GET', '/hello', '200 OK')
 
-    def test_app_raises_if_a_request_leads_to_more_than_one_endpoint(self):
+    def test_app_responds_with_405_if_path_matches_but_method_does_not(self):
+        class Hello1(Endpoint):
+            path = '/hello'
+            def get(self, request, response):
+                pass
+        class Hello2(Endpoint):
+            path = '/hello'
+            def post(self, request, response):
+                pass
+        app = App()
+        app.endpoint(Hello1)
+        app.endpoint(Hello2)
+        expected_status = '405 Method Not Allowed'
+        expected_headers = {'Content-Type': 'text/html; charset=utf-8', 'Content-Length': '0', 'Allow': 'GET, POST'}
+        self.assert_call(app, 'DELETE', '/hello', expected_status, expected_headers, b'')
+
+    def test_app_raises_on_registration_if_a_request_can_lead_to_more_than_one_endpoint(self):
         class User1(Endpoint):
             path = '/users/:id'
             def get(self, request, response):
@@ -65,11 +82,9 @@ class AppEndpointTestCase(AppTestCase):
                 pass
         app = App()
         app.endpoint(User1)
-        app.endpoint(User2)
-        env = {'REQUEST_METHOD': 'GET', 'PATH_INFO': '/users/9'}
-        start_response = Mock()
         with self.assertRaises(AmbiguousEndpoints):
-            app(env, start_response)
+            app.endpoint(User2)
+        self.assertEqual(len(app.endpoints), 1)
 
     def test_app_sets_template_renderer_in_registered_endpoints(self):
         app = App()
@@ -85,3 +100,41 @@ class AppEndpointTestCase(AppTestCase):
         app.endpoint(Hello)
         app.endpoint(Hello)
         self.assertEqual(len(app.endpoints), 1)
+
+    def test_app_does_not_answer_conditional_requests_for_endpoints(self):
+        class Hello(JsonEndpoint):
+            path = '/hello'
+            def get(self, request, response):
+                response.headers['ETag'] = '"hello"'
+                response.json = {'hello': 'world'}
+        app = App()
+        app.endpoint(Hello)
+        self.assert_call(app, 'GET', '/hello', '200 OK', request_headers={'If-None-Match': '"hello"'})
+
+    def test_app_answers_conditional_requests_for_endpoint_files(self):
+        class Download(Endpoint):
+            path = '/download'
+            def get(self, request, response):
+                response.file('tests/test_app/resources/static1/robots.txt')
+        app = App()
+        app.endpoint(Download)
+        etag = Response().file('tests/test_app/resources/static1/robots.txt').headers['ETag']
+        self.assert_call(app, 'GET', '/download', '304 Not Modified', None, b'', {'If-None-Match': etag})
+        self.assert_call(app, 'GET', '/download', '200 OK', None, b'User-agent: *\nDisallow: /\n', {'If-None-Match': '"other"'})
+
+    def test_app_answers_range_requests_for_endpoint_files(self):
+        class Download(Endpoint):
+            path = '/download'
+            def get(self, request, response):
+                response.file('tests/test_app/resources/static1/robots.txt')
+        app = App()
+        app.endpoint(Download)
+        env = {'REQUEST_METHOD': 'GET', 'PATH_INFO': '/download', 'HTTP_RANGE': 'bytes=0-3', 'wsgi.file_wrapper': FileWrapper}
+        start_response = Mock()
+        body = b''.join(app(env, start_response))
+        status, headers = start_response.call_args[0]
+        headers = dict(headers)
+        self.assertEqual(status, '206 Partial Content')
+        self.assertEqual(headers['Content-Range'], 'bytes 0-3/26')
+        self.assertEqual(headers['Content-Length'], '4')
+        self.assertEqual(body, b'User')
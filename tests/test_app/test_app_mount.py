@@ -0,0 +1,127 @@
+from unittest.mock import Mock
+
+from .app_test_case import AppTestCase
+
+from gatekeeper import App, Endpoint, Request
+from gatekeeper.exceptions import InvalidMountPrefix
+
+
+class Paths(Endpoint):
+    path = '/users'
+    def get(self, request, response):
+        response.body = request.env['SCRIPT_NAME'] + ' ' + request.path
+
+
+class Hello(Endpoint):
+    path = '/hello'
+    def get(self, request, response):
+        response.body = b'hello'
+
+
+class Index(Endpoint):
+    path = '/'
+    def get(self, request, response):
+        response.body = b'index'
+
+
+class AppMountTestCase(AppTestCase):
+
+    def test_app_routes_prefixed_requests_to_mounted_app(self):
+        api = App()
+        api.endpoint(Paths)
+        app = App()
+        app.mount('/api', api)
+        self.assert_call(app, 'GET', '/api/users', '200 OK', None, b'/api /users')
+
+    def test_request_to_exact_prefix_reaches_root_of_mounted_app(self):
+        api = App()
+        api.endpoint(Index)
+        app = App()
+        app.mount('/api', api)
+        self.assert_call(app, 'GET', '/api', '200 OK', None, b'index')
+        self.assert_call(app, 'GET', '/api/', '200 OK', None, b'index')
+
+    def test_mounted_prefix_only_matches_whole_segments(self):
+        api = App()
+        api.endpoint(Paths)
+        app = App()
+        app.mount('/api', api)
+        self.assert_call(app, 'GET', '/apiusers', '404 Not Found')
+
+    def test_parent_app_does_not_route_to_its_own_endpoints_under_mounted_prefix(self):
+        class ApiHello(Endpoint):
+            path = '/api/hello'
+            def get(self, request, response):
+                pass
+        app = App()
+        app.endpoint(ApiHello)
+        app.mount('/api', App())
+        self.assert_call(app, 'GET', '/api/hello', '404 Not Found')
+
+    def test_parent_app_still_handles_other_paths(self):
+        app = App()
+        app.endpoint(Hello)
+        app.mount('/api', App())
+        self.assert_call(app, 'GET', '/hello', '200 OK', None, b'hello')
+
+    def test_app_can_be_mounted_on_nested_prefix(self):
+        api = App()
+        api.endpoint(Paths)
+        app = App()
+        app.mount('/api/v1/', api)
+        self.assert_call(app, 'GET', '/api/v1/users', '200 OK', None, b'/api/v1 /users')
+        self.assert_call(app, 'GET', '/api/users', '404 Not Found')
+
+    def test_longest_prefix_wins(self):
+        api = App()
+        api.endpoint(Paths)
+        api_v1 = App()
+        api_v1.endpoint(Paths)
+        app = App()
+        app.mount('/api', api)
+        app.mount('/api/v1', api_v1)
+        self.assert_call(app, 'GET', '/api/v1/users', '200 OK', None, b'/api/v1 /users')
+        self.assert_call(app, 'GET', '/api/users', '200 OK', None, b'/api /users')
+
+    def test_mounted_apps_can_be_nested(self):
+        admin = App()
+        admin.endpoint(Paths)
+        api = App()
+        api.mount('/admin', admin)
+        app = App()
+        app.mount('/api', api)
+        self.assert_call(app, 'GET', '/api/admin/users', '200 OK', None, b'/api/admin /users')
+
+    def test_mounted_app_renders_its_own_status_pages(self):
+        pages = App()
+        pages.pages('tests/test_app/resources/pages1')
+        app = App()
+        app.mount('/site', pages)
+        self.assert_call(app, 'GET', '/site/about', '200 OK', None, b'<h1> about </h1>')
+        self.assert_call(app, 'GET', '/site/foobar', '404 Not Found', None, b'<h1>Not Found</h1>')
+        self.assert_call(app, 'GET', '/foobar', '404 Not Found', None, b'')
+
+    def test_app_cannot_be_mounted_on_root(self):
+        app = App()
+        with self.assertRaises(InvalidMountPrefix):
+            app.mount('/', App())
+
+    def test_app_routes_requests_by_host(self):
+        admin = App()
+        admin.endpoint(Hello)
+        app = App()
+        app.host('Admin.example.com', admin)
+        env = {'REQUEST_METHOD': 'GET', 'PATH_INFO': '/hello', 'HTTP_HOST': 'admin.example.com:8000'}
+        start_response = Mock()
+        self.assertEqual(b''.join(app(env, start_response)), b'hello')
+        env['HTTP_HOST'] = 'example.com'
+        app(env, start_response)
+        self.assertEqual(start_response.call_args[0][0], '404 Not Found')
+
+    def test_handle_request_dispatches_to_mounted_app(self):
+        api = App()
+        api.endpoint(Paths)
+        app = App()
+        app.mount('/api', api)
+        response = app.handle_request(Request({'REQUEST_METHOD': 'GET', 'PATH_INFO': '/api/users', 'SCRIPT_NAME': ''}))
+        self.assertEqual(response.body, b'/api /users')
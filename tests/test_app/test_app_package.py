@@ -1,8 +1,14 @@
 from importlib import import_module
+import json
+import os
+import sys
+from tempfile import TemporaryDirectory
 from unittest.mock import patch
 
 from .app_test_case import AppTestCase
 from gatekeeper import App
+from gatekeeper.endpoints.lazy_endpoint import LazyEndpoint
+from gatekeeper.manifest import Manifest
 
 
 class AppPackageTestCase(AppTestCase):
@@ -53,3 +59,131 @@ class AppPackageTestCase(AppTestCase):
             app.package('tests.test_app.resources.empty_package')
         package = import_module('tests.test_app.resources.empty_package')
         mock.assert_called_once_with(package.__path__)
+
+    def test_app_can_save_manifest_of_discovered_endpoints(self):
+        app = App()
+        app.package('tests.test_app.resources.package1')
+        with TemporaryDirectory() as directory:
+            manifest_path = os.path.join(directory, 'routes.json')
+            app.save_manifest(manifest_path)
+            with open(manifest_path) as f:
+                manifest = json.load(f)
+        package = manifest['packages']['tests.test_app.resources.package1']
+        self.assertEqual(package['endpoints'], [{
+            'module': 'tests.test_app.resources.package1.endpoints.hello',
+            'class': 'Hello',
+            'path': '/hello',
+            'methods': ['GET'],
+        }])
+        self.assertIn(os.path.join('endpoints', 'hello.py'), package['files'])
+
+    def test_app_registers_endpoints_from_fresh_manifest_without_scanning_package(self):
+        app = App()
+        app.package('tests.test_app.resources.package1')
+        with TemporaryDirectory() as directory:
+            manifest_path = os.path.join(directory, 'routes.json')
+            app.save_manifest(manifest_path)
+            app = App()
+            with patch('gatekeeper.app.walk_packages') as mock:
+                app.package('tests.test_app.resources.package1', manifest=manifest_path)
+        self.assertEqual(mock.call_count, 0)
+        self.assert_call(app, 'GET', '/hello', '200 OK')
+
+    def test_app_scans_package_if_manifest_is_stale(self):
+        app = App()
+        app.package('tests.test_app.resources.package1')
+        with TemporaryDirectory() as directory:
+            manifest_path = os.path.join(directory, 'routes.json')
+            app.save_manifest(manifest_path)
+            with open(manifest_path) as f:
+                manifest = json.load(f)
+            files = manifest['packages']['tests.test_app.resources.package1']['files']
+            files[os.path.join('endpoints', 'hello.py')][0] -= 1
+            manifest['packages']['tests.test_app.resources.package1']['endpoints'] = []
+            with open(manifest_path, 'w') as f:
+                json.dump(manifest, f)
+            app = App()
+            app.package('tests.test_app.resources.package1', manifest=manifest_path)
+        self.assert_call(app, 'GET', '/hello', '200 OK')
+
+    def test_app_scans_package_if_manifest_does_not_cover_it(self):
+        app = App()
+        app.package('tests.test_app.resources.package1')
+        with TemporaryDirectory() as directory:
+            manifest_path = os.path.join(directory, 'routes.json')
+            app.save_manifest(manifest_path)
+            app = App()
+            app.package('tests.test_app.resources.package2', manifest=manifest_path)
+            app.package('tests.test_app.resources.package1', manifest=os.path.join(directory, 'missing.json'))
+        self.assert_call(app, 'GET', '/hello', '200 OK')
+        self.assert_call(app, 'GET', '/hello2', '200 OK')
+
+    def save_package4_manifest(self, manifest_path):
+        manifest = Manifest()
+        manifest.add_package('tests.test_app.resources.package4', [{
+            'module': 'tests.test_app.resources.package4.reports',
+            'class': 'Report',
+            'path': '/reports/:id<int>',
+            'methods': ['GET'],
+        }])
+        manifest.save(manifest_path)
+
+    def test_lazy_package_does_not_import_endpoint_modules_until_requested(self):
+        sys.modules.pop('tests.test_app.resources.package4.reports', None)
+        app = App()
+        with TemporaryDirectory() as directory:
+            manifest_path = os.path.join(directory, 'routes.json')
+            self.save_package4_manifest(manifest_path)
+            app.package('tests.test_app.resources.package4', manifest=manifest_path, lazy=True)
+        self.assertNotIn('tests.test_app.resources.package4.reports', sys.modules)
+        self.assertIsInstance(app.endpoints[0], LazyEndpoint)
+        self.assert_call(app, 'GET', '/reports/7', '200 OK', None, b'report 7')
+        self.assertIn('tests.test_app.resources.package4.reports', sys.modules)
+
+    def test_lazy_package_routes_without_importing_endpoint_modules(self):
+        sys.modules.pop('tests.test_app.resources.package4.reports', None)
+        app = App()
+        with TemporaryDirectory() as directory:
+            manifest_path = os.path.join(directory, 'routes.json')
+            self.save_package4_manifest(manifest_path)
+            app.package('tests.test_app.resources.package4', manifest=manifest_path, lazy=True)
+        self.assert_call(app, 'GET', '/reports/foo', '404 Not Found')
+        self.assert_call(app, 'POST', '/reports/7', '405 Method Not Allowed')
+        self.assertNotIn('tests.test_app.resources.package4.reports', sys.modules)
+
+    def test_endpoint_already_registered_lazily_is_not_registered_again(self):
+        from .resources.package4.reports import Report
+        app = App()
+        with TemporaryDirectory() as directory:
+            manifest_path = os.path.join(directory, 'routes.json')
+            self.save_package4_manifest(manifest_path)
+            app.package('tests.test_app.resources.package4', manifest=manifest_path, lazy=True)
+        app.endpoint(Report)
+        self.assertEqual(len(app.endpoints), 1)
+        self.assert_call(app, 'GET', '/reports/7', '200 OK', None, b'report 7')
+
+    def test_lazy_package_is_registered_only_once(self):
+        app = App()
+        with TemporaryDirectory() as directory:
+            manifest_path = os.path.join(directory, 'routes.json')
+            self.save_package4_manifest(manifest_path)
+            app.package('tests.test_app.resources.package4', manifest=manifest_path, lazy=True)
+            app.package('tests.test_app.resources.package4', manifest=manifest_path, lazy=True)
+        self.assertEqual(len(app.endpoints), 1)
+
+    def test_lazy_package_falls_back_to_eager_scan_without_fresh_manifest(self):
+        app = App()
+        app.package('tests.test_app.resources.package1', lazy=True)
+        self.assertNotIsInstance(app.endpoints[0], LazyEndpoint)
+        self.assert_call(app, 'GET', '/hello', '200 OK')
+
+    def test_lazy_package_manifest_can_be_saved_again(self):
+        app = App()
+        with TemporaryDirectory() as directory:
+            manifest_path = os.path.join(directory, 'routes.json')
+            self.save_package4_manifest(manifest_path)
+            app.package('tests.test_app.resources.package4', manifest=manifest_path, lazy=True)
+            app.save_manifest(manifest_path)
+            app = App()
+            app.package('tests.test_app.resources.package4', manifest=manifest_path, lazy=True)
+        self.assertIsInstance(app.endpoints[0], LazyEndpoint)
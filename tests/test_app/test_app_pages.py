@@ -1,6 +1,11 @@
+from hashlib import md5
+import os
+from tempfile import TemporaryDirectory
+
 from .app_test_case import AppTestCase
 
 from gatekeeper import App, Endpoint, HtmlEndpoint
+from gatekeeper.fragment_cache import FragmentCache
 from gatekeeper.exceptions import InvalidDirectory
 
 
@@ -15,10 +20,22 @@ class AppPagesTestCase(AppTestCase):
         app = App()
         app.pages('tests/test_app/resources/pages1')
         expected_status = '200 OK'
-        expected_headers = {'Content-Type': 'text/html; charset=utf-8', 'Content-Length': '16'}
         expected_body = b'<h1> about </h1>'
+        expected_headers = {
+            'Content-Type': 'text/html; charset=utf-8',
+            'Content-Length': '16',
+            'ETag': '"{}"'.format(md5(expected_body).hexdigest()),
+        }
         self.assert_call(app, 'GET', '/about', expected_status, expected_headers, expected_body)
 
+    def test_app_responds_not_modified_when_page_etag_matches(self):
+        app = App()
+        app.pages('tests/test_app/resources/pages1')
+        etag = '"{}"'.format(md5(b'<h1> about </h1>').hexdigest())
+        expected_headers = {'Content-Type': 'text/html; charset=utf-8', 'ETag': etag}
+        self.assert_call(app, 'GET', '/about', '304 Not Modified', expected_headers, b'', {'If-None-Match': etag})
+        self.assert_call(app, 'GET', '/about', '200 OK', None, b'<h1> about </h1>', {'If-None-Match': '"other"'})
+
     def test_app_can_render_a_page_even_if_it_ends_with_slash(self):
         app = App()
         app.pages('tests/test_app/resources/pages1')
@@ -28,16 +45,24 @@ class AppPagesTestCase(AppTestCase):
         app = App()
         app.pages('tests/test_app/resources/pages1')
         expected_status = '200 OK'
-        expected_headers = {'Content-Type': 'text/html; charset=utf-8', 'Content-Length': '16'}
         expected_body = b'<h1> index </h1>'
+        expected_headers = {
+            'Content-Type': 'text/html; charset=utf-8',
+            'Content-Length': '16',
+            'ETag': '"{}"'.format(md5(expected_body).hexdigest()),
+        }
         self.assert_call(app, 'GET', '/', expected_status, expected_headers, expected_body)
 
     def test_app_can_render_index_page_on_subdirectory(self):
         app = App()
         app.pages('tests/test_app/resources/pages1')
         expected_status = '200 OK'
-        expected_headers = {'Content-Type': 'text/html; charset=utf-8', 'Content-Length': '19'}
         expected_body = b'<h1> settings </h1>'
+        expected_headers = {
+            'Content-Type': 'text/html; charset=utf-8',
+            'Content-Length': '19',
+            'ETag': '"{}"'.format(md5(expected_body).hexdigest()),
+        }
         self.assert_call(app, 'GET', '/settings', expected_status, expected_headers, expected_body)
 
     def test_cannot_get_index_page_explicitly(self):
@@ -100,3 +125,105 @@ class AppPagesTestCase(AppTestCase):
         expected_headers = {'Content-Type': 'text/plain; charset=utf-8', 'Content-Length': '0'}
         expected_body = b''
         self.assert_call(app, 'GET', '/hello', expected_status, expected_headers, expected_body)
+
+    def test_app_renders_new_pages_after_reload(self):
+        with TemporaryDirectory() as directory:
+            app = App()
+            app.pages(directory)
+            with open(os.path.join(directory, 'new.html'), 'w') as f:
+                f.write('<h1> new </h1>')
+            self.assert_call(app, 'GET', '/new', '404 Not Found')
+            app.reload_pages()
+            self.assert_call(app, 'GET', '/new', '200 OK', None, b'<h1> new </h1>')
+
+    def test_app_polls_page_directories_for_changes(self):
+        with TemporaryDirectory() as directory:
+            app = App(pages_refresh_interval=0)
+            app.pages(directory)
+            self.assert_call(app, 'GET', '/new', '404 Not Found')
+            with open(os.path.join(directory, 'new.html'), 'w') as f:
+                f.write('<h1> new </h1>')
+            self.assert_call(app, 'GET', '/new', '200 OK', None, b'<h1> new </h1>')
+
+    def test_app_clears_route_cache_when_polling_finds_page_changes(self):
+        with TemporaryDirectory() as directory:
+            app = App(route_cache_size=10, pages_refresh_interval=0)
+            app.pages(directory)
+            self.assert_call(app, 'GET', '/new', '404 Not Found')
+            path = os.path.join(directory, 'new.html')
+            with open(path, 'w') as f:
+                f.write('<h1> new </h1>')
+            self.assert_call(app, 'GET', '/new', '200 OK', None, b'<h1> new </h1>')
+            os.remove(path)
+            self.assert_call(app, 'GET', '/new', '404 Not Found')
+
+    def test_app_responds_404_for_pages_deleted_before_reload(self):
+        for page_cache in (False, True):
+            with TemporaryDirectory() as directory:
+                path = os.path.join(directory, 'old.html')
+                with open(path, 'w') as f:
+                    f.write('<h1> old </h1>')
+                app = App(page_cache=page_cache)
+                app.pages(directory)
+                self.assert_call(app, 'GET', '/old', '200 OK', None, b'<h1> old </h1>')
+                os.remove(path)
+                self.assert_call(app, 'GET', '/old', '404 Not Found')
+
+    def test_app_serves_pages_from_page_cache(self):
+        app = App(page_cache=True)
+        app.pages('tests/test_app/resources/pages1')
+        self.assert_call(app, 'GET', '/about', '200 OK', None, b'<h1> about </h1>')
+        self.assert_call(app, 'GET', '/about', '200 OK', None, b'<h1> about </h1>')
+        self.assertEqual((app.page_cache.hits, app.page_cache.misses), (1, 1))
+
+    def test_app_renders_cached_pages_again_when_static_files_are_reloaded(self):
+        with TemporaryDirectory() as pages, TemporaryDirectory() as static:
+            with open(os.path.join(pages, 'home.html'), 'w') as f:
+                f.write("{{ asset_url('site.css') }}")
+            css_path = os.path.join(static, 'site.css')
+            with open(css_path, 'wb') as f:
+                f.write(b'body {}')
+            app = App(page_cache=True, production=True)
+            app.pages(pages)
+            app.static(static)
+            self.assert_call(app, 'GET', '/home', '200 OK', None, app.assets.url('site.css').encode('utf-8'))
+            with open(css_path, 'wb') as f:
+                f.write(b'body { margin: 0 }')
+            app.reload_static()
+            url = '/site.{}.css'.format(md5(b'body { margin: 0 }').hexdigest()[:8])
+            self.assert_call(app, 'GET', '/home', '200 OK', None, url.encode('utf-8'))
+
+    def test_app_does_not_cache_pages_by_default(self):
+        app = App()
+        self.assertIsNone(app.page_cache)
+
+    def test_app_in_production_does_not_reload_templates(self):
+        app = App(production=True, template_cache_size=50)
+        app.pages('tests/test_app/resources/pages1')
+        self.assert_call(app, 'GET', '/about', '200 OK')
+        self.assertFalse(app.template_renderer.jinja_env.auto_reload)
+        self.assertEqual(app.template_renderer.jinja_env.cache.capacity, 50)
+
+    def test_app_warmup_compiles_page_templates(self):
+        app = App()
+        app.pages('tests/test_app/resources/pages1')
+        compile_times = app.warmup()
+        self.assertIn('about.html', compile_times)
+        self.assertIn('settings/index.html', compile_times)
+
+    def test_status_page_does_not_replace_streamed_response(self):
+        class Hello(HtmlEndpoint):
+            path = '/hello'
+            def get(self, request, response):
+                response.stream('about.html')
+        app = App()
+        app.pages('tests/test_app/resources/pages1')
+        app.endpoint(Hello)
+        expected_headers = {'Content-Type': 'text/html; charset=utf-8'}
+        self.assert_call(app, 'GET', '/hello', '200 OK', expected_headers, b'<h1> about </h1>')
+
+    def test_app_uses_configured_fragment_cache(self):
+        fragment_cache = FragmentCache()
+        app = App(fragment_cache=fragment_cache)
+        self.assertIs(app.fragment_cache, fragment_cache)
+        self.assertIs(app.template_renderer.fragment_cache, fragment_cache)
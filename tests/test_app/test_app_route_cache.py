@@ -0,0 +1,85 @@
+from unittest.mock import patch
+
+from .app_test_case import AppTestCase
+
+from gatekeeper import App, Endpoint
+
+
+class Hello(Endpoint):
+    path = '/hello/:name'
+    def get(self, request, response):
+        response.body = 'hello ' + request.args['name']
+
+
+class World(Endpoint):
+    path = '/world'
+    def get(self, request, response):
+        response.body = b'world'
+
+
+class AppRouteCacheTestCase(AppTestCase):
+
+    def test_route_cache_is_disabled_by_default(self):
+        app = App()
+        app.endpoint(Hello)
+        self.assert_call(app, 'GET', '/hello/john', '200 OK')
+        self.assertEqual(len(app.route_cache), 0)
+
+    def test_app_resolves_cached_route(self):
+        app = App(route_cache_size=10)
+        app.endpoint(Hello)
+        self.assert_call(app, 'GET', '/hello/john', '200 OK', None, b'hello john')
+        with patch.object(app, '_find_match') as find_match:
+            self.assert_call(app, 'GET', '/hello/john', '200 OK', None, b'hello john')
+        self.assertEqual(find_match.call_count, 0)
+        self.assertEqual((app.route_cache.hits, app.route_cache.misses), (1, 1))
+
+    def test_cache_key_includes_method(self):
+        app = App(route_cache_size=10)
+        app.endpoint(Hello)
+        self.assert_call(app, 'GET', '/hello/john', '200 OK')
+        self.assert_call(app, 'POST', '/hello/john', '405 Method Not Allowed')
+
+    def test_app_caches_static_files_and_pages(self):
+        app = App(route_cache_size=10)
+        app.static('tests/test_app/resources/static1')
+        app.pages('tests/test_app/resources/pages1')
+        self.assert_call(app, 'GET', '/robots.txt', '200 OK')
+        self.assert_call(app, 'GET', '/about', '200 OK')
+        with patch.object(app, '_find_match') as find_match:
+            self.assert_call(app, 'GET', '/robots.txt', '200 OK', None, b'User-agent: *\nDisallow: /\n')
+            self.assert_call(app, 'GET', '/about', '200 OK', None, b'<h1> about </h1>')
+        self.assertEqual(find_match.call_count, 0)
+
+    def test_app_caches_misses(self):
+        app = App(route_cache_size=10)
+        self.assert_call(app, 'GET', '/world', '404 Not Found')
+        with patch.object(app, '_find_match') as find_match:
+            self.assert_call(app, 'GET', '/world', '404 Not Found')
+        self.assertEqual(find_match.call_count, 0)
+
+    def test_registering_endpoints_invalidates_cache(self):
+        app = App(route_cache_size=10)
+        self.assert_call(app, 'GET', '/world', '404 Not Found')
+        app.endpoint(World)
+        self.assert_call(app, 'GET', '/world', '200 OK')
+
+    def test_registering_static_and_page_directories_invalidates_cache(self):
+        app = App(route_cache_size=10)
+        self.assert_call(app, 'GET', '/robots.txt', '404 Not Found')
+        app.static('tests/test_app/resources/static1')
+        self.assert_call(app, 'GET', '/robots.txt', '200 OK')
+        self.assert_call(app, 'GET', '/about', '404 Not Found')
+        app.pages('tests/test_app/resources/pages1')
+        self.assert_call(app, 'GET', '/about', '200 OK')
+
+    def test_args_changed_by_endpoint_do_not_leak_into_cache(self):
+        class ChangeArgs(Endpoint):
+            path = '/users/:id'
+            def get(self, request, response):
+                response.body = request.args['id']
+                request.args['id'] = 'changed'
+        app = App(route_cache_size=10)
+        app.endpoint(ChangeArgs)
+        self.assert_call(app, 'GET', '/users/9', '200 OK', None, b'9')
+        self.assert_call(app, 'GET', '/users/9', '200 OK', None, b'9')
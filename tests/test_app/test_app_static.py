@@ -1,11 +1,26 @@
+from email.utils import formatdate
+import mimetypes
+import os
+from tempfile import TemporaryDirectory
+from unittest.mock import Mock, patch
+from wsgiref.util import FileWrapper
+
 from .app_test_case import AppTestCase
 
 from gatekeeper import App, Endpoint
 from gatekeeper.exceptions import InvalidDirectory
+from gatekeeper.responses.response import file_etag
 
 
 class AppStaticTestCase(AppTestCase):
 
+    def file_validators(self, path):
+        stat = os.stat(path)
+        return {
+            'ETag': file_etag(stat.st_size, stat.st_mtime),
+            'Last-Modified': formatdate(stat.st_mtime, usegmt=True),
+        }
+
     def test_app_can_serve_static_content(self):
         app = App()
         app.static('tests/test_app/resources/static1')
@@ -14,7 +29,9 @@ class AppStaticTestCase(AppTestCase):
             'Content-Type': 'text/plain',
             'Content-Length': '26',
             'Content-Disposition': 'inline; filename="robots.txt"',
+            'Accept-Ranges': 'bytes',
         }
+        expected_headers.update(self.file_validators('tests/test_app/resources/static1/robots.txt'))
         expected_body = b'User-agent: *\nDisallow: /\n'
         self.assert_call(app, 'GET', '/robots.txt', expected_status, expected_headers, expected_body)
 
@@ -26,7 +43,9 @@ class AppStaticTestCase(AppTestCase):
             'Content-Type': 'text/css',
             'Content-Length': '32',
             'Content-Disposition': 'inline; filename="simple.css"',
+            'Accept-Ranges': 'bytes',
         }
+        expected_headers.update(self.file_validators('tests/test_app/resources/static1/css/simple.css'))
         expected_body = b'body { margin: 0; padding: 0; }\n'
         self.assert_call(app, 'GET', '/css/simple.css', expected_status, expected_headers, expected_body)
 
@@ -59,3 +78,237 @@ class AppStaticTestCase(AppTestCase):
         app.static('tests/test_app/resources/static2')
         self.assert_call(app, 'GET', '/robots.txt', '200 OK')
         self.assert_call(app, 'GET', '/readme.txt', '200 OK')
+
+    def test_app_does_not_serve_files_outside_static_directory(self):
+        app = App()
+        app.static('tests/test_app/resources/static1/css')
+        self.assert_call(app, 'GET', '/../robots.txt', '404 Not Found')
+
+    def test_app_serves_new_static_files_after_reload(self):
+        with TemporaryDirectory() as directory:
+            app = App(route_cache_size=10)
+            app.static(directory)
+            self.assert_call(app, 'GET', '/new.txt', '404 Not Found')
+            with open(os.path.join(directory, 'new.txt'), 'wb') as f:
+                f.write(b'new')
+            self.assert_call(app, 'GET', '/new.txt', '404 Not Found')
+            app.reload_static()
+            self.assert_call(app, 'GET', '/new.txt', '200 OK', None, b'new')
+
+    def test_app_polls_static_directories_for_changes(self):
+        with TemporaryDirectory() as directory:
+            app = App(static_refresh_interval=0)
+            app.static(directory)
+            self.assert_call(app, 'GET', '/new.txt', '404 Not Found')
+            with open(os.path.join(directory, 'new.txt'), 'wb') as f:
+                f.write(b'new')
+            self.assert_call(app, 'GET', '/new.txt', '200 OK', None, b'new')
+
+    def test_app_clears_route_cache_when_polling_finds_static_changes(self):
+        with TemporaryDirectory() as directory:
+            app = App(route_cache_size=10, static_refresh_interval=0)
+            app.static(directory)
+            self.assert_call(app, 'GET', '/new.txt', '404 Not Found')
+            path = os.path.join(directory, 'new.txt')
+            with open(path, 'wb') as f:
+                f.write(b'new')
+            self.assert_call(app, 'GET', '/new.txt', '200 OK', None, b'new')
+            os.remove(path)
+            self.assert_call(app, 'GET', '/new.txt', '404 Not Found')
+
+    def test_app_responds_404_for_static_files_deleted_before_reload(self):
+        with TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'old.txt')
+            with open(path, 'wb') as f:
+                f.write(b'old')
+            app = App(route_cache_size=10)
+            app.static(directory)
+            self.assert_call(app, 'GET', '/old.txt', '200 OK', None, b'old')
+            os.remove(path)
+            self.assert_call(app, 'GET', '/old.txt', '404 Not Found')
+
+    def test_app_serves_plain_file_when_precompressed_sibling_is_deleted(self):
+        with TemporaryDirectory() as directory:
+            with open(os.path.join(directory, 'site.css'), 'wb') as f:
+                f.write(b'body {}')
+            with open(os.path.join(directory, 'site.css.gz'), 'wb') as f:
+                f.write(b'gzipped')
+            app = App()
+            app.static(directory)
+            os.remove(os.path.join(directory, 'site.css.gz'))
+            self.assert_call(app, 'GET', '/site.css', '200 OK', None, b'body {}', {'Accept-Encoding': 'gzip'})
+
+    def test_app_serves_static_files_under_prefix(self):
+        app = App()
+        app.static('tests/test_app/resources/static1', prefix='/assets')
+        self.assert_call(app, 'GET', '/assets/robots.txt', '200 OK', None, b'User-agent: *\nDisallow: /\n')
+        self.assert_call(app, 'GET', '/robots.txt', '404 Not Found')
+
+    def test_app_serves_static_files_from_unindexed_directory(self):
+        app = App()
+        app.static('tests/test_app/resources/static1', prefix='/assets', index=False)
+        self.assert_call(app, 'GET', '/assets/robots.txt', '200 OK', None, b'User-agent: *\nDisallow: /\n')
+        self.assert_call(app, 'GET', '/assets/missing.txt', '404 Not Found')
+
+    def test_app_hands_static_files_to_wsgi_file_wrapper(self):
+        app = App()
+        app.static('tests/test_app/resources/static1')
+        env = {'REQUEST_METHOD': 'GET', 'PATH_INFO': '/robots.txt', 'wsgi.file_wrapper': FileWrapper}
+        result = app(env, Mock())
+        self.assertIsInstance(result, FileWrapper)
+        self.assertEqual(b''.join(result), b'User-agent: *\nDisallow: /\n')
+        result.close()
+
+    def test_app_serves_static_files_from_file_cache(self):
+        app = App(static_cache_size=1024)
+        app.static('tests/test_app/resources/static1')
+        expected_headers = {
+            'Content-Type': 'text/plain',
+            'Content-Length': '26',
+            'Content-Disposition': 'inline; filename="robots.txt"',
+            'Accept-Ranges': 'bytes',
+        }
+        expected_headers.update(self.file_validators('tests/test_app/resources/static1/robots.txt'))
+        expected_body = b'User-agent: *\nDisallow: /\n'
+        self.assert_call(app, 'GET', '/robots.txt', '200 OK', expected_headers, expected_body)
+        self.assert_call(app, 'GET', '/robots.txt', '200 OK', expected_headers, expected_body)
+        self.assertEqual((app.static_file_cache.hits, app.static_file_cache.misses), (1, 1))
+        self.assertEqual(app.static_file_cache.resident_bytes, 26)
+
+    def test_app_responds_not_modified_when_etag_matches(self):
+        app = App()
+        app.static('tests/test_app/resources/static1')
+        validators = self.file_validators('tests/test_app/resources/static1/robots.txt')
+        request_headers = {'If-None-Match': validators['ETag']}
+        with patch('gatekeeper.responses.response.open') as open_mock:
+            self.assert_call(app, 'GET', '/robots.txt', '304 Not Modified', None, b'', request_headers)
+        self.assertFalse(open_mock.called)
+
+    def test_app_responds_not_modified_when_file_did_not_change_since_date(self):
+        app = App()
+        app.static('tests/test_app/resources/static1')
+        validators = self.file_validators('tests/test_app/resources/static1/robots.txt')
+        request_headers = {'If-Modified-Since': validators['Last-Modified']}
+        self.assert_call(app, 'GET', '/robots.txt', '304 Not Modified', None, b'', request_headers)
+
+    def test_app_serves_static_file_when_validators_do_not_match(self):
+        app = App()
+        app.static('tests/test_app/resources/static1')
+        request_headers = {'If-None-Match': 'W/"1-1"', 'If-Modified-Since': 'Thu, 01 Jan 1970 00:00:00 GMT'}
+        self.assert_call(app, 'GET', '/robots.txt', '200 OK', None, b'User-agent: *\nDisallow: /\n', request_headers)
+
+    def test_app_responds_not_modified_from_file_cache(self):
+        app = App(static_cache_size=1024)
+        app.static('tests/test_app/resources/static1')
+        validators = self.file_validators('tests/test_app/resources/static1/robots.txt')
+        self.assert_call(app, 'GET', '/robots.txt', '200 OK')
+        self.assert_call(app, 'GET', '/robots.txt', '304 Not Modified', None, b'', {'If-None-Match': validators['ETag']})
+
+    def test_app_serves_ranges_of_static_files(self):
+        app = App()
+        app.static('tests/test_app/resources/static1')
+        expected_headers = {
+            'Content-Type': 'text/plain',
+            'Content-Length': '8',
+            'Content-Range': 'bytes 14-21/26',
+            'Content-Disposition': 'inline; filename="robots.txt"',
+            'Accept-Ranges': 'bytes',
+        }
+        expected_headers.update(self.file_validators('tests/test_app/resources/static1/robots.txt'))
+        request_headers = {'Range': 'bytes=14-21'}
+        self.assert_call(app, 'GET', '/robots.txt', '206 Partial Content', expected_headers, b'Disallow', request_headers)
+
+    def test_app_serves_ranges_of_cached_static_files(self):
+        app = App(static_cache_size=1024)
+        app.static('tests/test_app/resources/static1')
+        self.assert_call(app, 'GET', '/robots.txt', '200 OK')
+        self.assert_call(app, 'GET', '/robots.txt', '206 Partial Content', None, b'Disallow', {'Range': 'bytes=14-21'})
+        self.assert_call(app, 'GET', '/robots.txt', '200 OK', None, b'User-agent: *\nDisallow: /\n')
+
+    def make_precompressed_app(self, directory, *extensions):
+        for name in ('app.js',) + tuple('app.js' + extension for extension in extensions):
+            with open(os.path.join(directory, name), 'wb') as f:
+                f.write(name.encode('utf-8'))
+        app = App()
+        app.static(directory)
+        return app
+
+    def test_app_serves_precompressed_sibling_accepted_by_client(self):
+        with TemporaryDirectory() as directory:
+            app = self.make_precompressed_app(directory, '.br', '.gz')
+            path = os.path.join(directory, 'app.js.br')
+            expected_headers = {
+                'Content-Type': mimetypes.guess_type('app.js')[0],
+                'Content-Length': '9',
+                'Content-Disposition': 'inline; filename="app.js"',
+                'Content-Encoding': 'br',
+                'Vary': 'Accept-Encoding',
+                'Accept-Ranges': 'bytes',
+            }
+            expected_headers.update(self.file_validators(path))
+            request_headers = {'Accept-Encoding': 'gzip, deflate, br'}
+            self.assert_call(app, 'GET', '/app.js', '200 OK', expected_headers, b'app.js.br', request_headers)
+
+    def test_app_negotiates_precompressed_sibling_by_quality(self):
+        with TemporaryDirectory() as directory:
+            app = self.make_precompressed_app(directory, '.br', '.gz')
+            self.assert_call(app, 'GET', '/app.js', None, None, b'app.js.gz', {'Accept-Encoding': 'gzip, br;q=0.5'})
+            self.assert_call(app, 'GET', '/app.js', None, None, b'app.js.gz', {'Accept-Encoding': 'gzip, br;q=0'})
+            self.assert_call(app, 'GET', '/app.js', None, None, b'app.js.br', {'Accept-Encoding': '*'})
+            self.assert_call(app, 'GET', '/app.js', None, None, b'app.js', {'Accept-Encoding': 'deflate'})
+
+    def test_app_serves_original_file_when_sibling_is_missing(self):
+        with TemporaryDirectory() as directory:
+            app = self.make_precompressed_app(directory, '.gz')
+            self.assert_call(app, 'GET', '/app.js', None, None, b'app.js', {'Accept-Encoding': 'br'})
+
+    def test_app_varies_original_file_by_encoding_when_siblings_exist(self):
+        with TemporaryDirectory() as directory:
+            app = self.make_precompressed_app(directory, '.gz')
+            env = {'REQUEST_METHOD': 'GET', 'PATH_INFO': '/app.js'}
+            start_response = Mock()
+            self.assertEqual(b''.join(app(env, start_response)), b'app.js')
+            headers = dict(start_response.call_args[0][1])
+            self.assertEqual(headers['Vary'], 'Accept-Encoding')
+            self.assertNotIn('Content-Encoding', headers)
+
+    def test_app_serves_fingerprinted_static_files_as_immutable(self):
+        app = App()
+        app.static('tests/test_app/resources/static1')
+        url = app.assets.url('robots.txt')
+        self.assertNotEqual(url, '/robots.txt')
+        env = {'REQUEST_METHOD': 'GET', 'PATH_INFO': url}
+        start_response = Mock()
+        self.assertEqual(b''.join(app(env, start_response)), b'User-agent: *\nDisallow: /\n')
+        headers = dict(start_response.call_args[0][1])
+        self.assertEqual(headers['Cache-Control'], 'public, max-age=31536000, immutable')
+        self.assert_call(app, 'GET', '/robots.00000000.txt', '404 Not Found')
+
+    def test_app_stops_serving_old_fingerprint_after_file_changes(self):
+        with TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'site.css')
+            with open(path, 'wb') as f:
+                f.write(b'body {}')
+            app = App(route_cache_size=10)
+            app.static(directory)
+            url = app.assets.url('site.css')
+            self.assert_call(app, 'GET', url, '200 OK', None, b'body {}')
+            with open(path, 'wb') as f:
+                f.write(b'body { margin: 0 }')
+            self.assert_call(app, 'GET', url, '404 Not Found')
+            self.assert_call(app, 'GET', app.assets.url('site.css'), '200 OK', None, b'body { margin: 0 }')
+
+    def test_app_does_not_serve_plain_static_files_as_immutable(self):
+        app = App()
+        app.static('tests/test_app/resources/static1')
+        env = {'REQUEST_METHOD': 'GET', 'PATH_INFO': '/robots.txt'}
+        start_response = Mock()
+        app(env, start_response)
+        self.assertNotIn('Cache-Control', dict(start_response.call_args[0][1]))
+
+    def test_pages_can_link_fingerprinted_assets(self):
+        app = App()
+        app.static('tests/test_app/resources/static1')
+        app.pages('tests/test_app/resources/pages3')
+        expected_body = '<link href="{}">'.format(app.assets.url('css/simple.css')).encode('utf-8')
+        self.assert_call(app, 'GET', '/assets', '200 OK', None, expected_body)
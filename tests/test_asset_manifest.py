@@ -0,0 +1,83 @@
+from hashlib import md5
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from gatekeeper.asset_manifest import AssetManifest
+from gatekeeper.static_index import StaticIndex
+
+
+class AssetManifestTestCase(TestCase):
+
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.static_index = StaticIndex()
+        self.assets = AssetManifest(self.static_index)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write_file(self, name, content):
+        path = os.path.join(self.directory.name, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(content)
+        return md5(content).hexdigest()[:8]
+
+    def test_url_has_content_hash_before_extension(self):
+        fingerprint = self.write_file('css/site.min.css', b'body {}')
+        self.static_index.add_directory(self.directory.name)
+        self.assertEqual(self.assets.url('css/site.min.css'), '/css/site.min.{}.css'.format(fingerprint))
+        self.assertEqual(self.assets.url('/css/site.min.css'), '/css/site.min.{}.css'.format(fingerprint))
+
+    def test_url_of_file_without_extension(self):
+        fingerprint = self.write_file('LICENSE', b'MIT')
+        self.static_index.add_directory(self.directory.name)
+        self.assertEqual(self.assets.url('LICENSE'), '/LICENSE.' + fingerprint)
+        self.assertEqual(self.assets.resolve('/LICENSE.' + fingerprint), '/LICENSE')
+
+    def test_url_includes_directory_prefix(self):
+        fingerprint = self.write_file('site.css', b'body {}')
+        self.static_index.add_directory(self.directory.name, '/assets')
+        self.assertEqual(self.assets.url('assets/site.css'), '/assets/site.{}.css'.format(fingerprint))
+
+    def test_url_of_unknown_file_is_left_alone(self):
+        self.static_index.add_directory(self.directory.name)
+        self.assertEqual(self.assets.url('css/missing.css'), '/css/missing.css')
+
+    def test_urls_map_logical_paths_to_fingerprinted_paths(self):
+        fingerprint1 = self.write_file('css/site.css', b'body {}')
+        fingerprint2 = self.write_file('app.js', b'alert(1)')
+        self.static_index.add_directory(self.directory.name)
+        self.assertEqual(self.assets.urls(), {
+            'css/site.css': 'css/site.{}.css'.format(fingerprint1),
+            'app.js': 'app.{}.js'.format(fingerprint2),
+        })
+
+    def test_resolve_gives_logical_path_of_current_fingerprint(self):
+        fingerprint = self.write_file('css/site.css', b'body {}')
+        self.static_index.add_directory(self.directory.name)
+        self.assertEqual(self.assets.resolve('/css/site.{}.css'.format(fingerprint)), '/css/site.css')
+
+    def test_resolve_rejects_stale_or_unknown_fingerprints(self):
+        self.write_file('css/site.css', b'body {}')
+        self.static_index.add_directory(self.directory.name)
+        self.assertIsNone(self.assets.resolve('/css/site.00000000.css'))
+        self.assertIsNone(self.assets.resolve('/css/other.00000000.css'))
+        self.assertIsNone(self.assets.resolve('/css/site.css'))
+
+    def test_fingerprints_follow_changes_to_the_file(self):
+        old_fingerprint = self.write_file('site.css', b'body {}')
+        self.static_index.add_directory(self.directory.name)
+        self.assets.url('site.css')
+        fingerprint = self.write_file('site.css', b'body { margin: 0 }')
+        self.assertEqual(self.assets.url('site.css'), '/site.{}.css'.format(fingerprint))
+        self.assertEqual(self.assets.resolve('/site.{}.css'.format(fingerprint)), '/site.css')
+        self.assertIsNone(self.assets.resolve('/site.{}.css'.format(old_fingerprint)))
+
+    def test_deleted_file_has_no_fingerprint(self):
+        fingerprint = self.write_file('site.css', b'body {}')
+        self.static_index.add_directory(self.directory.name)
+        os.remove(os.path.join(self.directory.name, 'site.css'))
+        self.assertEqual(self.assets.url('site.css'), '/site.css')
+        self.assertIsNone(self.assets.resolve('/site.{}.css'.format(fingerprint)))
@@ -0,0 +1,52 @@
+from unittest import TestCase
+from uuid import UUID
+
+from gatekeeper.converters import CONVERTERS, parse_param
+from gatekeeper.exceptions import UnknownConverter
+
+
+class ConvertersTestCase(TestCase):
+
+    def test_untyped_param_uses_str_converter(self):
+        self.assertEqual(parse_param('id'), ('id', CONVERTERS['str']))
+
+    def test_typed_param_uses_its_converter(self):
+        self.assertEqual(parse_param('id<int>'), ('id', CONVERTERS['int']))
+
+    def test_unknown_type_raises(self):
+        with self.assertRaises(UnknownConverter):
+            parse_param('id<foo>')
+
+    def test_str_converter(self):
+        converter = CONVERTERS['str']
+        self.assertTrue(converter.match('john doe'))
+        self.assertFalse(converter.match(''))
+        self.assertEqual(converter.to_python('john'), 'john')
+
+    def test_int_converter(self):
+        converter = CONVERTERS['int']
+        self.assertTrue(converter.match('42'))
+        self.assertFalse(converter.match('-42'))
+        self.assertFalse(converter.match('4a'))
+        self.assertFalse(converter.match(''))
+        self.assertEqual(converter.to_python('42'), 42)
+
+    def test_slug_converter(self):
+        converter = CONVERTERS['slug']
+        self.assertTrue(converter.match('hello-world_2'))
+        self.assertFalse(converter.match('hello world'))
+        self.assertEqual(converter.to_python('hello-world'), 'hello-world')
+
+    def test_uuid_converter(self):
+        converter = CONVERTERS['uuid']
+        value = '0b9d6a2e-5e2d-4b8e-9f0c-2f4d7c1a3b5e'
+        self.assertTrue(converter.match(value))
+        self.assertFalse(converter.match('0b9d6a2e'))
+        self.assertEqual(converter.to_python(value), UUID(value))
+
+    def test_converters_overlap(self):
+        self.assertTrue(CONVERTERS['int'].overlaps(CONVERTERS['int']))
+        self.assertTrue(CONVERTERS['int'].overlaps(CONVERTERS['str']))
+        self.assertTrue(CONVERTERS['int'].overlaps(CONVERTERS['slug']))
+        self.assertTrue(CONVERTERS['slug'].overlaps(CONVERTERS['uuid']))
+        self.assertFalse(CONVERTERS['int'].overlaps(CONVERTERS['uuid']))
@@ -3,7 +3,7 @@ from unittest.mock import Mock
 
 from gatekeeper import Request, Response, Endpoint
 from gatekeeper.template_renderer import TemplateRenderer
-from gatekeeper.exceptions import TemplateRendererNotSet
+from gatekeeper.exceptions import TemplateRendererNotSet, UnknownConverter
 
 
 class EndpointTestCase(TestCase):
@@ -77,6 +77,17 @@ class EndpointTestCase(TestCase):
         endpoint.path = '/users/:id'
         self.assertEqual(endpoint._path_regex(), r'^/users/(?P<id>[^\/]+)$')
 
+    def test_path_regex_when_path_is_typed_simple_pattern(self):
+        endpoint = Endpoint()
+        endpoint.path = '/users/:id<int>/:slug<slug>'
+        self.assertEqual(endpoint._path_regex(), r'^/users/(?P<id>[0-9]+)/(?P<slug>[-a-zA-Z0-9_]+)$')
+
+    def test_endpoint_with_unknown_param_type_cannot_be_created(self):
+        class TypedEndpoint(Endpoint):
+            path = '/users/:id<foo>'
+        with self.assertRaises(UnknownConverter):
+            TypedEndpoint()
+
     def test_endpoint_does_not_transform_any_colon_in_simple_pattern(self):
         endpoint = Endpoint()
         endpoint.path = '/users/foo:id'
@@ -143,6 +154,37 @@ class EndpointTestCase(TestCase):
         response = endpoint.handle_request(request)
         self.assertEqual(request.args, {'id': '9', 'username': 'john'})
 
+    def test_endpoint_typed_url_args_are_converted(self):
+        class ArgsEndpoint(Endpoint):
+            path = '/users/:id<int>/:username'
+            def get(self, request, response):
+                pass
+        endpoint = ArgsEndpoint()
+        request = Request({'REQUEST_METHOD': 'GET', 'PATH_INFO': '/users/9/john'})
+        endpoint.handle_request(request)
+        self.assertEqual(request.args, {'id': 9, 'username': 'john'})
+
+    def test_endpoint_does_not_match_typed_pattern_with_wrong_type(self):
+        class ArgsEndpoint(Endpoint):
+            path = '/users/:id<int>'
+            def get(self, request, response):
+                pass
+        endpoint = ArgsEndpoint()
+        request = Request({'REQUEST_METHOD': 'GET', 'PATH_INFO': '/users/john'})
+        self.assertFalse(endpoint.match_request(request))
+
+    def test_endpoint_uses_args_given_to_handle_request(self):
+        class ArgsEndpoint(Endpoint):
+            path = '/users/:id'
+            def get(self, request, response):
+                pass
+        endpoint = ArgsEndpoint()
+        endpoint._compiled_regex = Mock()
+        request = Request({'REQUEST_METHOD': 'GET', 'PATH_INFO': '/users/9'})
+        endpoint.handle_request(request, {'id': '9'})
+        self.assertEqual(request.args, {'id': '9'})
+        self.assertEqual(endpoint._compiled_regex.match.call_count, 0)
+
     def test_endpoint_without_arguments_have_empty_dict_as_args(self):
         class ArgsEndpoint(Endpoint):
             path = '/users'
@@ -311,6 +353,44 @@ class EndpointTestCase(TestCase):
         self.assertFalse(endpoint.match_request(request))
         self.assertEqual(endpoint.foobar.call_count, 0)
 
+    def test_endpoint_supported_methods(self):
+        class MethodsEndpoint(Endpoint):
+            path = '/'
+            def get(self, request, response):
+                pass
+            def post(self, request, response):
+                pass
+            def foobar(self, request, response):
+                pass
+        endpoint = MethodsEndpoint()
+        self.assertEqual(endpoint.supported_methods(), ('GET', 'POST'))
+
+    def test_bound_handlers_are_used_after_binding(self):
+        class BoundEndpoint(Endpoint):
+            path = '/'
+            def get(self, request, response):
+                response.body = b'bound'
+        endpoint = BoundEndpoint()
+        endpoint.bind_handlers()
+        endpoint.post = Mock()
+        self.assertEqual(endpoint.supported_methods(), ('GET',))
+        request = Request({'REQUEST_METHOD': 'POST', 'PATH_INFO': '/'})
+        self.assertFalse(endpoint.match_request(request))
+        request = Request({'REQUEST_METHOD': 'GET', 'PATH_INFO': '/'})
+        self.assertEqual(endpoint.handle_request(request).body, b'bound')
+
+    def test_bound_hooks_are_called(self):
+        class BoundEndpoint(Endpoint):
+            path = '/'
+            def before_request(self, request, response):
+                response.body = b'hello'
+            def get(self, request, response):
+                response.body += b' world'
+        endpoint = BoundEndpoint()
+        endpoint.bind_handlers()
+        request = Request({'REQUEST_METHOD': 'GET', 'PATH_INFO': '/'})
+        self.assertEqual(endpoint.handle_request(request).body, b'hello world')
+
     def test_render_works_if_template_renderer_is_set(self):
         renderer = TemplateRenderer()
         renderer.add_directory('tests/test_endpoint/templates')
@@ -0,0 +1,37 @@
+from unittest import TestCase
+
+from gatekeeper import Request
+from gatekeeper.endpoints.lazy_endpoint import LazyEndpoint
+from gatekeeper.template_renderer import TemplateRenderer
+
+
+class LazyEndpointTestCase(TestCase):
+
+    def make_endpoint(self):
+        return LazyEndpoint({
+            'module': 'tests.test_app.resources.package1.endpoints.hello',
+            'class': 'Hello',
+            'path': '/hello',
+            'methods': ['GET'],
+        })
+
+    def test_lazy_endpoint_takes_path_and_methods_from_entry(self):
+        endpoint = self.make_endpoint()
+        self.assertEqual(endpoint.path, '/hello')
+        self.assertEqual(endpoint.supported_methods(), ('GET',))
+
+    def test_lazy_endpoint_loads_real_endpoint_once(self):
+        endpoint = self.make_endpoint()
+        self.assertIs(endpoint.endpoint, endpoint.endpoint)
+        self.assertEqual(type(endpoint.endpoint).__name__, 'Hello')
+
+    def test_lazy_endpoint_passes_template_renderer_to_real_endpoint(self):
+        endpoint = self.make_endpoint()
+        endpoint.template_renderer = TemplateRenderer()
+        self.assertIs(endpoint.endpoint.template_renderer, endpoint.template_renderer)
+
+    def test_lazy_endpoint_delegates_requests_to_real_endpoint(self):
+        endpoint = self.make_endpoint()
+        request = Request({'REQUEST_METHOD': 'GET', 'PATH_INFO': '/hello'})
+        response = endpoint.handle_request(request, {})
+        self.assertEqual(response.body, b'hello world')
@@ -0,0 +1,79 @@
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import patch
+
+from gatekeeper.fragment_cache import FragmentCache, MemoryFragmentStore, FileFragmentStore
+
+
+class FragmentCacheTestCase(TestCase):
+
+    def test_cache_renders_fragment_once(self):
+        cache = FragmentCache()
+        self.assertEqual(cache.fetch('nav', None, lambda: '<nav>1</nav>'), '<nav>1</nav>')
+        self.assertEqual(cache.fetch('nav', None, lambda: '<nav>2</nav>'), '<nav>1</nav>')
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertEqual(cache.hit_ratio, 0.5)
+
+    def test_cache_keys_are_strings(self):
+        cache = FragmentCache()
+        cache.fetch(('sidebar', 9), None, lambda: 'sidebar')
+        self.assertEqual(cache.store.get("('sidebar', 9)"), 'sidebar')
+
+    def test_cache_can_be_cleared(self):
+        cache = FragmentCache()
+        cache.fetch('nav', None, lambda: '<nav>1</nav>')
+        cache.clear()
+        self.assertEqual(cache.fetch('nav', None, lambda: '<nav>2</nav>'), '<nav>2</nav>')
+
+
+class MemoryFragmentStoreTestCase(TestCase):
+
+    def test_store_returns_stored_value(self):
+        store = MemoryFragmentStore()
+        store.set('key', 'value')
+        self.assertEqual(store.get('key'), 'value')
+        self.assertIsNone(store.get('other'))
+
+    def test_store_expires_values_after_ttl(self):
+        store = MemoryFragmentStore()
+        with patch('gatekeeper.fragment_cache.time', return_value=100):
+            store.set('key', 'value', 10)
+        with patch('gatekeeper.fragment_cache.time', return_value=109):
+            self.assertEqual(store.get('key'), 'value')
+        with patch('gatekeeper.fragment_cache.time', return_value=110):
+            self.assertIsNone(store.get('key'))
+        self.assertEqual(len(store), 0)
+
+    def test_store_evicts_least_recently_used_values(self):
+        store = MemoryFragmentStore(size=2)
+        store.set('a', 'a')
+        store.set('b', 'b')
+        store.get('a')
+        store.set('c', 'c')
+        self.assertEqual((store.get('a'), store.get('b'), store.get('c')), ('a', None, 'c'))
+
+
+class FileFragmentStoreTestCase(TestCase):
+
+    def test_store_shares_values_between_instances(self):
+        with TemporaryDirectory() as directory:
+            FileFragmentStore(directory).set('key', 'value')
+            self.assertEqual(FileFragmentStore(directory).get('key'), 'value')
+            self.assertIsNone(FileFragmentStore(directory).get('other'))
+
+    def test_store_expires_values_after_ttl(self):
+        with TemporaryDirectory() as directory:
+            store = FileFragmentStore(directory)
+            with patch('gatekeeper.fragment_cache.time', return_value=100):
+                store.set('key', 'value', 10)
+            with patch('gatekeeper.fragment_cache.time', return_value=109):
+                self.assertEqual(store.get('key'), 'value')
+            with patch('gatekeeper.fragment_cache.time', return_value=110):
+                self.assertIsNone(store.get('key'))
+
+    def test_store_can_be_cleared(self):
+        with TemporaryDirectory() as directory:
+            store = FileFragmentStore(directory)
+            store.set('key', 'value')
+            store.clear()
+            self.assertIsNone(store.get('key'))
@@ -0,0 +1,83 @@
+from hashlib import md5
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import patch
+
+from gatekeeper.page_cache import PageCache
+from gatekeeper.template_renderer import TemplateRenderer
+
+
+class PageCacheTestCase(TestCase):
+
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.write_template('base.html', '<h1>{% block content %}{% endblock %}</h1>{% include "footer.html" %}')
+        self.write_template('footer.html', '<footer>2019</footer>')
+        self.write_template('about.html', '{% extends "base.html" %}{% block content %}about{% endblock %}')
+        self.renderer = TemplateRenderer()
+        self.renderer.add_directory(self.directory.name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write_template(self, name, source, mtime=None):
+        path = os.path.join(self.directory.name, name)
+        with open(path, 'w') as f:
+            f.write(source)
+        if mtime is not None:
+            os.utime(path, (mtime, mtime))
+
+    def test_cache_responds_with_rendered_page(self):
+        cache = PageCache(self.renderer)
+        response = cache.response('about.html')
+        body = b'<h1>about</h1><footer>2019</footer>'
+        self.assertEqual(response.body, body)
+        self.assertEqual(response.headers['Content-Type'], 'text/html; charset=utf-8')
+        self.assertEqual(response.headers['ETag'], '"{}"'.format(md5(body).hexdigest()))
+
+    def test_cache_does_not_render_page_again(self):
+        cache = PageCache(self.renderer)
+        cache.response('about.html')
+        with patch.object(self.renderer, 'render') as render:
+            response = cache.response('about.html')
+        self.assertFalse(render.called)
+        self.assertEqual(response.body, b'<h1>about</h1><footer>2019</footer>')
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_cache_gives_independent_responses(self):
+        cache = PageCache(self.renderer)
+        cache.response('about.html').headers['X-Foo'] = 'bar'
+        self.assertNotIn('X-Foo', cache.response('about.html').headers)
+
+    def test_cache_renders_page_again_when_an_included_template_changes(self):
+        cache = PageCache(self.renderer)
+        cache.response('about.html')
+        self.write_template('footer.html', '<footer>2020</footer>', mtime=0)
+        self.assertEqual(cache.response('about.html').body, b'<h1>about</h1><footer>2020</footer>')
+
+    def test_cache_renders_page_again_when_an_extended_template_changes(self):
+        cache = PageCache(self.renderer)
+        cache.response('about.html')
+        self.write_template('base.html', '<h2>{% block content %}{% endblock %}</h2>', mtime=0)
+        self.assertEqual(cache.response('about.html').body, b'<h2>about</h2>')
+
+    def test_cache_without_template_checks_keeps_stale_pages(self):
+        cache = PageCache(self.renderer, check_templates=False)
+        cache.response('about.html')
+        self.write_template('footer.html', '<footer>2020</footer>', mtime=0)
+        self.assertEqual(cache.response('about.html').body, b'<h1>about</h1><footer>2019</footer>')
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+    def test_cache_does_not_hold_pages_with_dynamic_includes(self):
+        self.write_template('dynamic.html', '{% include "foot" + "er.html" %}')
+        cache = PageCache(self.renderer)
+        self.assertEqual(cache.response('dynamic.html').body, b'<footer>2019</footer>')
+        self.assertEqual(len(cache), 0)
+
+    def test_cache_does_not_hold_pages_with_missing_includes(self):
+        self.write_template('optional.html', '{% include "missing.html" ignore missing %}{% include "footer.html" %}')
+        cache = PageCache(self.renderer)
+        self.assertEqual(cache.response('optional.html').body, b'<footer>2019</footer>')
+        self.assertEqual(len(cache), 0)
@@ -0,0 +1,76 @@
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import patch
+
+from gatekeeper.page_index import PageIndex
+
+
+class PageIndexTestCase(TestCase):
+
+    def write_file(self, directory, path):
+        path = os.path.join(directory, path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write('page')
+
+    def make_index(self, directory, *template_paths, **kwargs):
+        for template_path in template_paths:
+            self.write_file(directory, template_path)
+        index = PageIndex(**kwargs)
+        index.add_directory(directory)
+        return index
+
+    def test_index_finds_regular_and_index_pages(self):
+        with TemporaryDirectory() as directory:
+            index = self.make_index(directory, 'index.html', 'about.html', 'settings/index.html', 'settings/users.html')
+            self.assertEqual(index.find('/'), 'index.html')
+            self.assertEqual(index.find('/about'), 'about.html')
+            self.assertEqual(index.find('/about/'), 'about.html')
+            self.assertEqual(index.find('/settings'), 'settings/index.html')
+            self.assertEqual(index.find('/settings/users'), 'settings/users.html')
+
+    def test_index_pages_cannot_be_referenced_explicitly(self):
+        with TemporaryDirectory() as directory:
+            index = self.make_index(directory, 'index.html', 'settings/index.html', 'docs/index/index.html')
+            self.assertIsNone(index.find('/index'))
+            self.assertIsNone(index.find('/settings/index'))
+            self.assertIsNone(index.find('/docs/index'))
+
+    def test_index_only_finds_html_templates(self):
+        with TemporaryDirectory() as directory:
+            index = self.make_index(directory, 'about.txt', '.html', 'about.html.html')
+            self.assertIsNone(index.find('/about'))
+            self.assertIsNone(index.find('/'))
+            self.assertEqual(index.find('/about.html'), 'about.html.html')
+
+    def test_regular_pages_have_priority_over_index_pages(self):
+        with TemporaryDirectory() as directory1, TemporaryDirectory() as directory2:
+            self.write_file(directory1, 'about/index.html')
+            self.write_file(directory2, 'about.html')
+            index = PageIndex()
+            index.add_directory(directory1)
+            index.add_directory(directory2)
+            self.assertEqual(index.find('/about'), 'about.html')
+
+    def test_lookups_do_not_touch_the_filesystem(self):
+        with TemporaryDirectory() as directory:
+            index = self.make_index(directory, 'about.html')
+            with patch('os.stat') as stat, patch('os.path.isfile') as isfile:
+                index.find('/about')
+                index.find('/missing')
+            self.assertEqual((stat.call_count, isfile.call_count), (0, 0))
+
+    def test_index_sees_new_pages_after_reload(self):
+        with TemporaryDirectory() as directory:
+            index = self.make_index(directory)
+            self.write_file(directory, 'about.html')
+            self.assertIsNone(index.find('/about'))
+            index.reload()
+            self.assertEqual(index.find('/about'), 'about.html')
+
+    def test_index_refreshes_when_directories_change(self):
+        with TemporaryDirectory() as directory:
+            index = self.make_index(directory, refresh_interval=0)
+            self.write_file(directory, 'about.html')
+            self.assertEqual(index.find('/about'), 'about.html')
@@ -6,8 +6,9 @@ from types import GeneratorType
 
 from unittest import TestCase
 from unittest.mock import Mock
+from wsgiref.util import FileWrapper
 
-from gatekeeper import Response
+from gatekeeper import Request, Response
 from gatekeeper.template_renderer import TemplateRenderer
 from gatekeeper.exceptions import TemplateRendererNotSet
 
@@ -144,6 +145,233 @@ class ResponseTestCase(TestCase):
                 contents += chunk
             self.assertEqual(contents, b'hello world')
 
+    def test_file_is_handed_to_wsgi_file_wrapper_when_available(self):
+        response = Response()
+        with NamedTemporaryFile() as tmpfile:
+            tmpfile.write(b'hello world')
+            tmpfile.seek(0)
+            response.file(tmpfile.name)
+            start_respose = Mock()
+            file_wrapper = Mock()
+            result = response.wsgi(start_respose, {'wsgi.file_wrapper': file_wrapper})
+            self.assertIs(result, file_wrapper.return_value)
+            f, chunk_size = file_wrapper.call_args[0]
+            self.assertEqual(f.name, tmpfile.name)
+            self.assertEqual(f.read(), b'hello world')
+            f.close()
+
+    def test_file_is_yielded_in_chunks_without_wsgi_file_wrapper(self):
+        response = Response()
+        with NamedTemporaryFile() as tmpfile:
+            response.file(tmpfile.name)
+            start_respose = Mock()
+            self.assertIsInstance(response.wsgi(start_respose, {}), GeneratorType)
+
+    def test_body_is_not_handed_to_wsgi_file_wrapper(self):
+        response = Response()
+        response.body = 'hello world'
+        file_wrapper = Mock()
+        self.assertEqual(response.wsgi(Mock(), {'wsgi.file_wrapper': file_wrapper}), (b'hello world',))
+        self.assertFalse(file_wrapper.called)
+
+    def test_setting_file_sets_validators(self):
+        response = Response()
+        with NamedTemporaryFile() as tmpfile:
+            tmpfile.write(b'hello world')
+            tmpfile.flush()
+            os.utime(tmpfile.name, (0, 784111777))
+            response.file(tmpfile.name)
+            self.assertEqual(response.headers['ETag'], 'W/"b-{:x}"'.format(784111777 * 10 ** 6))
+            self.assertEqual(response.headers['Last-Modified'], 'Sun, 06 Nov 1994 08:49:37 GMT')
+
+    def test_conditional_response_is_not_modified_when_etag_matches(self):
+        response = Response()
+        response.body = 'hello world'
+        response.headers['ETag'] = '"abc"'
+        request = Request({'REQUEST_METHOD': 'GET', 'HTTP_IF_NONE_MATCH': '"xyz", W/"abc"'})
+        self.assertIs(response.conditional(request), response)
+        self.assertEqual(response.status, 304)
+        self.assertEqual(response.body, b'')
+        self.assertNotIn('Content-Length', dict(response._wsgi_headers()))
+
+    def test_conditional_response_is_not_modified_for_any_etag(self):
+        response = Response()
+        response.headers['ETag'] = '"abc"'
+        request = Request({'REQUEST_METHOD': 'GET', 'HTTP_IF_NONE_MATCH': '*'})
+        self.assertEqual(response.conditional(request).status, 304)
+
+    def test_conditional_response_prefers_etag_over_date(self):
+        response = Response()
+        response.headers['ETag'] = '"abc"'
+        response.headers['Last-Modified'] = 'Sun, 06 Nov 1994 08:49:37 GMT'
+        request = Request({
+            'REQUEST_METHOD': 'GET',
+            'HTTP_IF_NONE_MATCH': '"xyz"',
+            'HTTP_IF_MODIFIED_SINCE': 'Sun, 06 Nov 1994 08:49:37 GMT',
+        })
+        self.assertEqual(response.conditional(request).status, 200)
+
+    def test_conditional_response_compares_modification_dates(self):
+        response = Response()
+        response.headers['Last-Modified'] = 'Sun, 06 Nov 1994 08:49:37 GMT'
+        request = Request({'REQUEST_METHOD': 'GET', 'HTTP_IF_MODIFIED_SINCE': 'Sun, 06 Nov 1994 08:49:36 GMT'})
+        self.assertEqual(response.conditional(request).status, 200)
+        request = Request({'REQUEST_METHOD': 'GET', 'HTTP_IF_MODIFIED_SINCE': 'Mon, 07 Nov 1994 08:49:37 GMT'})
+        self.assertEqual(response.conditional(request).status, 304)
+
+    def test_conditional_response_ignores_invalid_dates(self):
+        response = Response()
+        response.headers['Last-Modified'] = 'Sun, 06 Nov 1994 08:49:37 GMT'
+        request = Request({'REQUEST_METHOD': 'GET', 'HTTP_IF_MODIFIED_SINCE': 'yesterday'})
+        self.assertEqual(response.conditional(request).status, 200)
+
+    def test_conditional_response_only_applies_to_successful_reads(self):
+        response = Response()
+        response.headers['ETag'] = '"abc"'
+        request = Request({'REQUEST_METHOD': 'POST', 'HTTP_IF_NONE_MATCH': '"abc"'})
+        self.assertEqual(response.conditional(request).status, 200)
+        response.status = 404
+        request = Request({'REQUEST_METHOD': 'GET', 'HTTP_IF_NONE_MATCH': '"abc"'})
+        self.assertEqual(response.conditional(request).status, 404)
+
+    def make_range_request(self, range_header, **headers):
+        env = {'REQUEST_METHOD': 'GET', 'HTTP_RANGE': range_header}
+        for key, value in headers.items():
+            env['HTTP_' + key.upper()] = value
+        return Request(env)
+
+    def wsgi_body(self, response, env=None):
+        return b''.join(response.wsgi(Mock(), env))
+
+    def test_file_response_sends_requested_range(self):
+        response = Response()
+        with NamedTemporaryFile() as tmpfile:
+            tmpfile.write(b'hello world')
+            tmpfile.flush()
+            response.file(tmpfile.name).conditional(self.make_range_request('bytes=0-4'))
+            self.assertEqual(response.status, 206)
+            self.assertEqual(response.headers['Content-Range'], 'bytes 0-4/11')
+            self.assertEqual(response.headers['Content-Length'], '5')
+            self.assertEqual(self.wsgi_body(response), b'hello')
+
+    def test_file_response_sends_open_ended_and_suffix_ranges(self):
+        with NamedTemporaryFile() as tmpfile:
+            tmpfile.write(b'hello world')
+            tmpfile.flush()
+            response = Response().file(tmpfile.name).conditional(self.make_range_request('bytes=6-'))
+            self.assertEqual(self.wsgi_body(response), b'world')
+            response = Response().file(tmpfile.name).conditional(self.make_range_request('bytes=-3'))
+            self.assertEqual(response.headers['Content-Range'], 'bytes 8-10/11')
+            self.assertEqual(self.wsgi_body(response), b'rld')
+            response = Response().file(tmpfile.name).conditional(self.make_range_request('bytes=6-100'))
+            self.assertEqual(response.headers['Content-Range'], 'bytes 6-10/11')
+
+    def test_file_response_sends_multiple_ranges_as_multipart(self):
+        with NamedTemporaryFile(suffix='.txt') as tmpfile:
+            tmpfile.write(b'hello world')
+            tmpfile.flush()
+            response = Response().file(tmpfile.name).conditional(self.make_range_request('bytes=0-1, 6-7'))
+            self.assertEqual(response.status, 206)
+            content_type = response.headers['Content-Type']
+            self.assertTrue(content_type.startswith('multipart/byteranges; boundary='))
+            boundary = content_type.split('=')[1]
+            expected_body = (
+                '--{0}\r\nContent-Type: text/plain\r\nContent-Range: bytes 0-1/11\r\n\r\nhe'
+                '\r\n--{0}\r\nContent-Type: text/plain\r\nContent-Range: bytes 6-7/11\r\n\r\nwo'
+                '\r\n--{0}--\r\n'
+            ).format(boundary).encode('utf-8')
+            body = self.wsgi_body(response, {'wsgi.file_wrapper': Mock()})
+            self.assertEqual(body, expected_body)
+            self.assertEqual(response.headers['Content-Length'], str(len(expected_body)))
+
+    def test_single_range_is_not_sent_past_its_end_by_wsgi_file_wrapper(self):
+        with NamedTemporaryFile() as tmpfile:
+            tmpfile.write(b'hello world')
+            tmpfile.flush()
+            response = Response().file(tmpfile.name).conditional(self.make_range_request('bytes=6-7'))
+            body = self.wsgi_body(response, {'wsgi.file_wrapper': FileWrapper})
+            self.assertEqual(body, b'wo')
+            self.assertEqual(response.headers['Content-Length'], '2')
+
+    def test_overlapping_and_adjacent_ranges_are_merged(self):
+        with NamedTemporaryFile() as tmpfile:
+            tmpfile.write(b'hello world')
+            tmpfile.flush()
+            response = Response().file(tmpfile.name).conditional(self.make_range_request('bytes=6-, 0-, 0-'))
+            self.assertEqual(response.headers['Content-Range'], 'bytes 0-10/11')
+            self.assertEqual(self.wsgi_body(response), b'hello world')
+            response = Response().file(tmpfile.name).conditional(self.make_range_request('bytes=3-4, 0-2'))
+            self.assertEqual(response.headers['Content-Range'], 'bytes 0-4/11')
+            self.assertEqual(self.wsgi_body(response), b'hello')
+
+    def test_too_many_ranges_are_ignored(self):
+        with NamedTemporaryFile() as tmpfile:
+            tmpfile.write(b'hello world')
+            tmpfile.flush()
+            range_header = 'bytes=' + ', '.join('{0}-{0}'.format(i % 11) for i in range(17))
+            response = Response().file(tmpfile.name).conditional(self.make_range_request(range_header))
+            self.assertEqual(response.status, 200)
+            self.assertEqual(self.wsgi_body(response), b'hello world')
+
+    def test_unsatisfiable_range_responds_416(self):
+        with NamedTemporaryFile() as tmpfile:
+            tmpfile.write(b'hello world')
+            tmpfile.flush()
+            response = Response().file(tmpfile.name).conditional(self.make_range_request('bytes=20-30'))
+            self.assertEqual(response.status, 416)
+            self.assertEqual(response.headers['Content-Range'], 'bytes */11')
+            self.assertEqual(self.wsgi_body(response), b'')
+
+    def test_invalid_range_is_ignored(self):
+        with NamedTemporaryFile() as tmpfile:
+            tmpfile.write(b'hello world')
+            tmpfile.flush()
+            for range_header in ('bytes=5-1', 'bytes=a-b', 'items=0-1', 'bytes=-', 'bytes=--1'):
+                response = Response().file(tmpfile.name).conditional(self.make_range_request(range_header))
+                self.assertEqual(response.status, 200)
+                self.assertEqual(self.wsgi_body(response), b'hello world')
+
+    def test_range_is_ignored_when_if_range_does_not_match(self):
+        with NamedTemporaryFile() as tmpfile:
+            tmpfile.write(b'hello world')
+            tmpfile.flush()
+            response = Response().file(tmpfile.name)
+            last_modified = response.headers['Last-Modified']
+            response.conditional(self.make_range_request('bytes=0-4', if_range=last_modified))
+            self.assertEqual(response.status, 206)
+            response = Response().file(tmpfile.name)
+            response.conditional(self.make_range_request('bytes=0-4', if_range='Thu, 01 Jan 1970 00:00:00 GMT'))
+            self.assertEqual(response.status, 200)
+            response = Response().file(tmpfile.name)
+            response.conditional(self.make_range_request('bytes=0-4', if_range=response.headers['ETag']))
+            self.assertEqual(response.status, 200)
+
+    def test_body_response_sends_range_when_accepting_ranges(self):
+        response = Response()
+        response.body = 'hello world'
+        response.conditional(self.make_range_request('bytes=0-4'))
+        self.assertEqual(response.status, 200)
+        response.headers['Accept-Ranges'] = 'bytes'
+        response.conditional(self.make_range_request('bytes=0-4'))
+        self.assertEqual(response.status, 206)
+        self.assertEqual(response.body, b'hello')
+
+    def test_streamed_template_is_sent_without_content_length(self):
+        response = Response()
+        response.template_renderer = TemplateRenderer()
+        response.template_renderer.add_directory('tests/test_response/templates')
+        self.assertIs(response.stream('with_context.html', {'name': 'John'}), response)
+        self.assertTrue(response.is_streaming)
+        start_respose = Mock()
+        body = b''.join(response.wsgi(start_respose))
+        self.assertEqual(body, response.template_renderer.render('with_context.html', {'name': 'John'}).encode('utf-8'))
+        self.assertNotIn('Content-Length', dict(start_respose.call_args[0][1]))
+
+    def test_stream_without_template_renderer_triggers_exception(self):
+        response = Response()
+        with self.assertRaises(TemplateRendererNotSet):
+            response.stream('hello.html')
+
     def test_setting_file_with_specified_mime_type(self):
         response = Response()
         with NamedTemporaryFile() as tmpfile:
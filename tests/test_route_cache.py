@@ -0,0 +1,73 @@
+from threading import Thread
+from unittest import TestCase
+
+from gatekeeper.route_cache import RouteCache
+
+
+class RouteCacheTestCase(TestCase):
+
+    def test_disabled_cache_stores_nothing(self):
+        cache = RouteCache()
+        cache.set('key', 'value')
+        self.assertEqual(cache.get('key'), None)
+        self.assertEqual(len(cache), 0)
+        self.assertEqual((cache.hits, cache.misses), (0, 0))
+
+    def test_cache_returns_stored_value(self):
+        cache = RouteCache(10)
+        cache.set('key', 'value')
+        self.assertEqual(cache.get('key'), 'value')
+
+    def test_cache_returns_default_for_missing_key(self):
+        cache = RouteCache(10)
+        default = object()
+        self.assertIs(cache.get('key', default), default)
+
+    def test_cache_can_store_none(self):
+        cache = RouteCache(10)
+        cache.set('key', None)
+        self.assertIsNone(cache.get('key', 'default'))
+
+    def test_cache_counts_hits_and_misses(self):
+        cache = RouteCache(10)
+        cache.get('key')
+        cache.set('key', 'value')
+        cache.get('key')
+        cache.get('key')
+        self.assertEqual((cache.hits, cache.misses), (2, 1))
+
+    def test_cache_evicts_least_recently_used_key(self):
+        cache = RouteCache(2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.get('b'), None)
+        self.assertEqual(cache.get('c'), 3)
+        self.assertEqual(len(cache), 2)
+
+    def test_clear_removes_every_entry(self):
+        cache = RouteCache(10)
+        cache.set('a', 1)
+        cache.clear()
+        self.assertEqual(cache.get('a'), None)
+
+    def test_cache_can_be_shared_between_threads(self):
+        cache = RouteCache(2)
+        errors = []
+        def use_cache(offset):
+            try:
+                for i in range(2000):
+                    key = (offset + i) % 5
+                    cache.set(key, key)
+                    cache.get(key)
+            except Exception as e:
+                errors.append(e)
+        threads = [Thread(target=use_cache, args=(offset,)) for offset in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertLessEqual(len(cache), 2)
@@ -0,0 +1,237 @@
+from unittest import TestCase
+
+from gatekeeper import Request, Endpoint
+from gatekeeper.exceptions import AmbiguousEndpoints
+from gatekeeper.router import Router, RouteMatch
+
+
+class RouterTestCase(TestCase):
+
+    def make_endpoint(self, endpoint_path, method='get'):
+        class RouterEndpoint(Endpoint):
+            path = endpoint_path
+        setattr(RouterEndpoint, method, lambda self, request, response: None)
+        return RouterEndpoint()
+
+    def make_request(self, path, method='GET'):
+        return Request({'REQUEST_METHOD': method, 'PATH_INFO': path})
+
+    def matched_endpoint(self, router, request):
+        match = router.match(request)
+        return match.endpoint if match else None
+
+    def test_router_without_endpoints_matches_nothing(self):
+        router = Router()
+        self.assertIsNone(router.match(self.make_request('/')))
+
+    def test_router_matches_exact_path(self):
+        router = Router()
+        endpoint = self.make_endpoint('/users')
+        router.add(endpoint)
+        self.assertIs(self.matched_endpoint(router, self.make_request('/users')), endpoint)
+        self.assertIsNone(self.matched_endpoint(router, self.make_request('/users/')))
+        self.assertIsNone(self.matched_endpoint(router, self.make_request('/user')))
+
+    def test_router_matches_root_path(self):
+        router = Router()
+        endpoint = self.make_endpoint('/')
+        router.add(endpoint)
+        self.assertIs(self.matched_endpoint(router, self.make_request('/')), endpoint)
+        self.assertIsNone(self.matched_endpoint(router, self.make_request('')))
+
+    def test_router_matches_simple_pattern(self):
+        router = Router()
+        endpoint = self.make_endpoint('/users/:id/delete')
+        router.add(endpoint)
+        self.assertIs(self.matched_endpoint(router, self.make_request('/users/9/delete')), endpoint)
+        self.assertIsNone(self.matched_endpoint(router, self.make_request('/users//delete')))
+        self.assertIsNone(self.matched_endpoint(router, self.make_request('/users/9')))
+        self.assertIsNone(self.matched_endpoint(router, self.make_request('/users/9/delete/now')))
+
+    def test_router_does_not_consider_colon_without_name_a_pattern(self):
+        router = Router()
+        endpoint = self.make_endpoint('/users/:')
+        router.add(endpoint)
+        self.assertIs(self.matched_endpoint(router, self.make_request('/users/:')), endpoint)
+        self.assertIsNone(self.matched_endpoint(router, self.make_request('/users/9')))
+
+    def test_router_matches_explicit_regex(self):
+        router = Router()
+        endpoint = self.make_endpoint(r'^/static/(?P<path>.+)$')
+        router.add(endpoint)
+        self.assertIs(self.matched_endpoint(router, self.make_request('/static/css/site.css')), endpoint)
+        self.assertIsNone(self.matched_endpoint(router, self.make_request('/static/')))
+
+    def test_router_matches_static_and_pattern_branches_of_the_same_node(self):
+        router = Router()
+        endpoint1 = self.make_endpoint('/users/new/edit')
+        endpoint2 = self.make_endpoint('/users/:id')
+        router.add(endpoint1)
+        router.add(endpoint2)
+        self.assertIs(self.matched_endpoint(router, self.make_request('/users/new')), endpoint2)
+        self.assertIs(self.matched_endpoint(router, self.make_request('/users/new/edit')), endpoint1)
+
+    def test_router_filters_endpoints_by_method(self):
+        router = Router()
+        endpoint1 = self.make_endpoint('/users', 'get')
+        endpoint2 = self.make_endpoint('/users', 'post')
+        router.add(endpoint1)
+        router.add(endpoint2)
+        self.assertIs(self.matched_endpoint(router, self.make_request('/users', 'POST')), endpoint2)
+        self.assertIsNone(self.matched_endpoint(router, self.make_request('/users', 'PUT')))
+
+    def test_router_ignores_endpoints_without_path(self):
+        router = Router()
+        router.add(self.make_endpoint(None))
+        self.assertIsNone(router.match(self.make_request('/')))
+
+    def test_router_captures_args_of_simple_pattern(self):
+        router = Router()
+        endpoint = self.make_endpoint('/users/:id/posts/:post_id')
+        router.add(endpoint)
+        match = router.match(self.make_request('/users/9/posts/12'))
+        self.assertEqual(match, RouteMatch(endpoint, {'id': '9', 'post_id': '12'}))
+
+    def test_router_captures_args_of_explicit_regex(self):
+        router = Router()
+        endpoint = self.make_endpoint(r'^/static/(?P<path>.+)$')
+        router.add(endpoint)
+        match = router.match(self.make_request('/static/css/site.css'))
+        self.assertEqual(match, RouteMatch(endpoint, {'path': 'css/site.css'}))
+
+    def test_router_captures_no_args_for_exact_path(self):
+        router = Router()
+        endpoint = self.make_endpoint('/users')
+        router.add(endpoint)
+        self.assertEqual(router.match(self.make_request('/users')), RouteMatch(endpoint, {}))
+
+    def test_route_match_hands_args_to_endpoint(self):
+        router = Router()
+        endpoint = self.make_endpoint('/users/:id')
+        router.add(endpoint)
+        endpoint._compiled_regex = None
+        request = self.make_request('/users/9')
+        router.match(request).handle_request(request)
+        self.assertEqual(request.args, {'id': '9'})
+
+    def test_router_tells_allowed_methods_for_a_path(self):
+        router = Router()
+        router.add(self.make_endpoint('/users', 'get'))
+        router.add(self.make_endpoint('/users', 'post'))
+        router.add(self.make_endpoint(r'^/users/$', 'delete'))
+        router.add(self.make_endpoint(r'^/users$', 'delete'))
+        self.assertEqual(router.allowed_methods(self.make_request('/users', 'PUT')), {'GET', 'POST', 'DELETE'})
+        self.assertEqual(router.allowed_methods(self.make_request('/foo', 'PUT')), set())
+
+    def test_router_rejects_repeated_exact_path(self):
+        router = Router()
+        router.add(self.make_endpoint('/users'))
+        with self.assertRaises(AmbiguousEndpoints):
+            router.add(self.make_endpoint('/users'))
+
+    def test_router_rejects_overlapping_simple_patterns(self):
+        router = Router()
+        router.add(self.make_endpoint('/users/:id/edit'))
+        with self.assertRaises(AmbiguousEndpoints):
+            router.add(self.make_endpoint('/users/:userid/edit'))
+
+    def test_router_rejects_simple_pattern_overlapping_exact_path(self):
+        router = Router()
+        router.add(self.make_endpoint('/users/new'))
+        with self.assertRaises(AmbiguousEndpoints):
+            router.add(self.make_endpoint('/users/:id'))
+        router = Router()
+        router.add(self.make_endpoint('/users/:id'))
+        with self.assertRaises(AmbiguousEndpoints):
+            router.add(self.make_endpoint('/users/new'))
+
+    def test_router_rejects_exact_path_matched_by_regex(self):
+        router = Router()
+        router.add(self.make_endpoint(r'^/users/(?P<id>\d+)$'))
+        with self.assertRaises(AmbiguousEndpoints):
+            router.add(self.make_endpoint('/users/9'))
+        router = Router()
+        router.add(self.make_endpoint('/users/9'))
+        with self.assertRaises(AmbiguousEndpoints):
+            router.add(self.make_endpoint(r'^/users/(?P<id>\d+)$'))
+
+    def test_router_rejects_regex_matching_exact_path_when_prefix_is_optional(self):
+        router = Router()
+        router.add(self.make_endpoint('/user'))
+        with self.assertRaises(AmbiguousEndpoints):
+            router.add(self.make_endpoint(r'^/users?'))
+
+    def test_router_accepts_overlapping_paths_with_different_methods(self):
+        router = Router()
+        router.add(self.make_endpoint('/users/:id', 'get'))
+        router.add(self.make_endpoint('/users/new', 'post'))
+        router.add(self.make_endpoint(r'^/users/.*$', 'put'))
+
+    def test_router_accepts_paths_that_do_not_overlap(self):
+        router = Router()
+        router.add(self.make_endpoint('/users/:id'))
+        router.add(self.make_endpoint('/users/:id/edit'))
+        router.add(self.make_endpoint('/users'))
+        router.add(self.make_endpoint('/users/'))
+        router.add(self.make_endpoint(r'^/posts/(?P<id>\d+)$'))
+        router.add(self.make_endpoint('/posts/new'))
+
+    def test_router_gives_first_registered_regex_priority(self):
+        router = Router()
+        endpoint1 = self.make_endpoint(r'^/files/(?P<path>.+)$')
+        endpoint2 = self.make_endpoint(r'^/files/(?P<name>[^/]+)$')
+        router.add(endpoint1)
+        router.add(endpoint2)
+        self.assertIs(self.matched_endpoint(router, self.make_request('/files/readme.txt')), endpoint1)
+
+    def test_router_gives_segment_tree_priority_over_regex(self):
+        router = Router()
+        endpoint1 = self.make_endpoint(r'^/files/(?P<path>.+)$')
+        endpoint2 = self.make_endpoint('/files/:name')
+        router.add(endpoint1)
+        router.add(endpoint2)
+        self.assertIs(self.matched_endpoint(router, self.make_request('/files/readme.txt')), endpoint2)
+
+    def test_router_converts_typed_params(self):
+        router = Router()
+        endpoint = self.make_endpoint('/users/:id<int>/posts/:slug<slug>')
+        router.add(endpoint)
+        match = router.match(self.make_request('/users/9/posts/hello-world'))
+        self.assertEqual(match, RouteMatch(endpoint, {'id': 9, 'slug': 'hello-world'}))
+
+    def test_router_rejects_segments_that_do_not_fit_the_param_type(self):
+        router = Router()
+        router.add(self.make_endpoint('/users/:id<int>'))
+        self.assertIsNone(router.match(self.make_request('/users/john')))
+        self.assertEqual(router.allowed_methods(self.make_request('/users/john', 'POST')), set())
+
+    def test_router_branches_on_param_type(self):
+        router = Router()
+        endpoint1 = self.make_endpoint('/users/:id<int>')
+        endpoint2 = self.make_endpoint('/users/:uuid<uuid>')
+        router.add(endpoint1)
+        router.add(endpoint2)
+        self.assertIs(self.matched_endpoint(router, self.make_request('/users/9')), endpoint1)
+        uuid = '0b9d6a2e-5e2d-4b8e-9f0c-2f4d7c1a3b5e'
+        self.assertIs(self.matched_endpoint(router, self.make_request('/users/' + uuid)), endpoint2)
+
+    def test_router_rejects_overlapping_param_types(self):
+        router = Router()
+        router.add(self.make_endpoint('/users/:id<int>'))
+        with self.assertRaises(AmbiguousEndpoints):
+            router.add(self.make_endpoint('/users/:slug<slug>'))
+
+    def test_router_rejects_exact_path_fitting_typed_param(self):
+        router = Router()
+        router.add(self.make_endpoint('/users/:id<int>'))
+        with self.assertRaises(AmbiguousEndpoints):
+            router.add(self.make_endpoint('/users/9'))
+
+    def test_router_accepts_exact_path_not_fitting_typed_param(self):
+        router = Router()
+        endpoint1 = self.make_endpoint('/users/:id<int>')
+        endpoint2 = self.make_endpoint('/users/new')
+        router.add(endpoint1)
+        router.add(endpoint2)
+        self.assertIs(self.matched_endpoint(router, self.make_request('/users/new')), endpoint2)
+        self.assertIs(self.matched_endpoint(router, self.make_request('/users/9')), endpoint1)
@@ -0,0 +1,104 @@
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import patch
+
+from gatekeeper.static_file_cache import StaticFileCache
+
+
+class StaticFileCacheTestCase(TestCase):
+
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write_file(self, name, content):
+        path = os.path.join(self.directory.name, name)
+        with open(path, 'wb') as f:
+            f.write(content)
+        return path
+
+    def test_disabled_cache_stores_nothing(self):
+        cache = StaticFileCache()
+        self.assertIsNone(cache.get(self.write_file('site.css', b'body {}')))
+        self.assertEqual((len(cache), cache.resident_bytes), (0, 0))
+
+    def test_cache_holds_body_and_headers(self):
+        cache = StaticFileCache(1024)
+        path = self.write_file('site.css', b'body {}')
+        entry = cache.get(path)
+        self.assertEqual(entry.body, b'body {}')
+        self.assertEqual(entry.mimetype, 'text/css')
+        self.assertEqual(entry.headers['Content-Length'], '7')
+        self.assertEqual(entry.headers['Content-Disposition'], 'inline; filename="site.css"')
+        self.assertEqual(entry.etag, entry.headers['ETag'])
+        self.assertTrue(entry.etag.startswith('W/"7-'))
+
+    def test_cache_builds_responses(self):
+        cache = StaticFileCache(1024)
+        response = cache.get(self.write_file('site.css', b'body {}')).response()
+        self.assertEqual(response.body, b'body {}')
+        self.assertEqual(response.headers['Content-Type'], 'text/css')
+
+    def test_cached_files_are_not_read_again(self):
+        cache = StaticFileCache(1024)
+        path = self.write_file('site.css', b'body {}')
+        cache.get(path)
+        with patch('gatekeeper.static_file_cache.open') as open_mock:
+            self.assertEqual(cache.get(path).body, b'body {}')
+        self.assertFalse(open_mock.called)
+
+    def test_cache_counts_hits_and_misses(self):
+        cache = StaticFileCache(1024)
+        path = self.write_file('site.css', b'body {}')
+        self.assertEqual(cache.hit_ratio, 0.0)
+        for i in range(4):
+            cache.get(path)
+        self.assertEqual((cache.hits, cache.misses), (3, 1))
+        self.assertEqual(cache.hit_ratio, 0.75)
+
+    def test_cache_does_not_hold_files_larger_than_max_file_size(self):
+        cache = StaticFileCache(1024, max_file_size=4)
+        self.assertIsNone(cache.get(self.write_file('site.css', b'body {}')))
+        self.assertEqual(len(cache), 0)
+
+    def test_cache_evicts_least_recently_used_files_over_the_budget(self):
+        cache = StaticFileCache(10)
+        path1 = self.write_file('1.txt', b'aaaa')
+        path2 = self.write_file('2.txt', b'bbbb')
+        path3 = self.write_file('3.txt', b'cccc')
+        cache.get(path1)
+        cache.get(path2)
+        cache.get(path1)
+        cache.get(path3)
+        self.assertEqual(cache.resident_bytes, 8)
+        cache.get(path1)
+        cache.get(path2)
+        self.assertEqual((cache.hits, cache.misses), (2, 4))
+
+    def test_cache_revalidates_by_mtime(self):
+        cache = StaticFileCache(1024, check_interval=0)
+        path = self.write_file('site.css', b'body {}')
+        cache.get(path)
+        self.write_file('site.css', b'body { margin: 0 }')
+        os.utime(path, (0, 0))
+        self.assertEqual(cache.get(path).body, b'body { margin: 0 }')
+        self.assertEqual(cache.resident_bytes, 18)
+
+    def test_cache_does_not_revalidate_before_check_interval(self):
+        cache = StaticFileCache(1024, check_interval=3600)
+        path = self.write_file('site.css', b'body {}')
+        cache.get(path)
+        with patch('os.stat') as stat:
+            cache.get(path)
+        self.assertFalse(stat.called)
+
+    def test_cache_drops_removed_files(self):
+        cache = StaticFileCache(1024, check_interval=0)
+        path = self.write_file('site.css', b'body {}')
+        cache.get(path)
+        os.remove(path)
+        self.assertIsNone(cache.get(path))
+        self.assertEqual((len(cache), cache.resident_bytes), (0, 0))
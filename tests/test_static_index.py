@@ -0,0 +1,148 @@
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import patch
+
+from gatekeeper.static_index import StaticIndex
+
+
+class StaticIndexTestCase(TestCase):
+
+    def write_file(self, directory, path, content=b''):
+        path = os.path.join(directory, path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(content)
+        return path
+
+    def test_index_finds_files_in_directory(self):
+        index = StaticIndex()
+        index.add_directory('tests/test_app/resources/static1')
+        self.assertEqual(index.find('/robots.txt'), 'tests/test_app/resources/static1/robots.txt')
+        self.assertEqual(index.find('/css/simple.css'), 'tests/test_app/resources/static1/css/simple.css')
+
+    def test_index_does_not_find_directories_or_missing_files(self):
+        index = StaticIndex()
+        index.add_directory('tests/test_app/resources/static1')
+        self.assertIsNone(index.find('/'))
+        self.assertIsNone(index.find('/css'))
+        self.assertIsNone(index.find('/missing.txt'))
+
+    def test_index_does_not_find_files_outside_directory(self):
+        index = StaticIndex()
+        index.add_directory('tests/test_app/resources/static1/css')
+        self.assertIsNone(index.find('/../robots.txt'))
+
+    def test_lookups_do_not_touch_the_filesystem(self):
+        index = StaticIndex()
+        index.add_directory('tests/test_app/resources/static1')
+        with patch('os.stat') as stat, patch('os.path.isfile') as isfile:
+            index.find('/robots.txt')
+            index.find('/missing.txt')
+        self.assertEqual((stat.call_count, isfile.call_count), (0, 0))
+
+    def test_directories_added_first_have_priority(self):
+        with TemporaryDirectory() as directory1, TemporaryDirectory() as directory2:
+            path1 = self.write_file(directory1, 'file.txt')
+            self.write_file(directory2, 'file.txt')
+            index = StaticIndex()
+            index.add_directory(directory1)
+            index.add_directory(directory2)
+            self.assertEqual(index.find('/file.txt'), path1)
+
+    def test_index_does_not_see_new_files_until_reloaded(self):
+        with TemporaryDirectory() as directory:
+            index = StaticIndex()
+            index.add_directory(directory)
+            path = self.write_file(directory, 'new.txt')
+            self.assertIsNone(index.find('/new.txt'))
+            index.reload()
+            self.assertEqual(index.find('/new.txt'), path)
+
+    def test_index_refreshes_when_directories_change(self):
+        with TemporaryDirectory() as directory:
+            index = StaticIndex(refresh_interval=0)
+            index.add_directory(directory)
+            os.makedirs(os.path.join(directory, 'css'))
+            index.find('/')
+            path = self.write_file(directory, 'css/new.css')
+            self.assertEqual(index.find('/css/new.css'), path)
+            os.remove(path)
+            self.assertIsNone(index.find('/css/new.css'))
+
+    def test_index_does_not_poll_before_refresh_interval(self):
+        with TemporaryDirectory() as directory:
+            index = StaticIndex(refresh_interval=3600)
+            index.add_directory(directory)
+            self.write_file(directory, 'new.txt')
+            self.assertIsNone(index.find('/new.txt'))
+
+    def test_prefixed_directory_serves_files_under_prefix_only(self):
+        index = StaticIndex()
+        index.add_directory('tests/test_app/resources/static1', '/assets')
+        self.assertEqual(index.find('/assets/robots.txt'), 'tests/test_app/resources/static1/robots.txt')
+        self.assertIsNone(index.find('/robots.txt'))
+        self.assertIsNone(index.find('/assetsrobots.txt'))
+
+    def test_unindexed_directory_looks_files_up_on_request(self):
+        with TemporaryDirectory() as directory:
+            index = StaticIndex(miss_ttl=0)
+            index.add_directory(directory, index=False)
+            self.assertIsNone(index.find('/new.txt'))
+            path = self.write_file(directory, 'new.txt')
+            self.assertEqual(index.find('/new.txt'), path)
+
+    def test_unindexed_directory_does_not_find_files_outside_directory(self):
+        index = StaticIndex()
+        index.add_directory('tests/test_app/resources/static1/css', index=False)
+        self.assertIsNone(index.find('/../robots.txt'))
+        self.assertIsNone(index.find('/'))
+
+    def test_unindexed_directory_is_not_checked_outside_prefix(self):
+        index = StaticIndex()
+        index.add_directory('tests/test_app/resources/static1', '/assets', index=False)
+        with patch('os.path.isfile') as isfile:
+            index.find('/users/9')
+        self.assertEqual(isfile.call_count, 0)
+
+    def test_unindexed_directory_misses_are_cached(self):
+        index = StaticIndex()
+        index.add_directory('tests/test_app/resources/static1', index=False)
+        self.assertIsNone(index.find('/missing.txt'))
+        with patch('os.path.isfile') as isfile:
+            self.assertIsNone(index.find('/missing.txt'))
+        self.assertEqual(isfile.call_count, 0)
+
+    def test_cached_misses_expire(self):
+        index = StaticIndex(miss_ttl=10)
+        index.add_directory('tests/test_app/resources/static1', index=False)
+        with patch('gatekeeper.static_index.time', return_value=100):
+            index.find('/missing.txt')
+        with patch('gatekeeper.static_index.time', return_value=111), patch('os.path.isfile') as isfile:
+            isfile.return_value = False
+            index.find('/missing.txt')
+        self.assertEqual(isfile.call_count, 1)
+
+    def test_cached_misses_are_cleared_on_reload(self):
+        with TemporaryDirectory() as directory:
+            index = StaticIndex()
+            index.add_directory(directory, index=False)
+            self.assertIsNone(index.find('/new.txt'))
+            path = self.write_file(directory, 'new.txt')
+            index.reload()
+            self.assertEqual(index.find('/new.txt'), path)
+
+    def test_miss_cache_is_bounded(self):
+        index = StaticIndex(miss_cache_size=2)
+        index.add_directory('tests/test_app/resources/static1', index=False)
+        for path in ('/a', '/b', '/c'):
+            index.find(path)
+        self.assertEqual(len(index.misses), 2)
+        self.assertFalse(index.misses.contains('/a'))
+        self.assertTrue(index.misses.contains('/c'))
+
+    def test_misses_of_indexed_directories_are_not_cached(self):
+        index = StaticIndex()
+        index.add_directory('tests/test_app/resources/static1')
+        index.find('/missing.txt')
+        self.assertEqual(len(index.misses), 0)
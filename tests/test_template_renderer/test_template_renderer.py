@@ -1,6 +1,12 @@
+import os
+from tempfile import TemporaryDirectory
 from unittest import TestCase
+from unittest.mock import patch
+from jinja2 import FileSystemBytecodeCache
 from jinja2.exceptions import TemplateNotFound
-from gatekeeper.template_renderer import TemplateRenderer
+from gatekeeper.exceptions import UnknownBytecodeCache
+from gatekeeper.fragment_cache import FragmentCache, FileFragmentStore
+from gatekeeper.template_renderer import MemoryBytecodeStore, TemplateRenderer
 
 
 class TemplateRendererTestCase(TestCase):
@@ -85,3 +91,162 @@ class TemplateRendererTestCase(TestCase):
         renderer = TemplateRenderer()
         renderer.add_package('tests.test_template_renderer.resources.package1')
         self.assertEqual(renderer.has_page('tests.test_template_renderer.resources.package1/simple.html'), False)
+
+    def test_can_render_template_with_globals(self):
+        renderer = TemplateRenderer()
+        renderer.add_directory('tests/test_template_renderer/resources/templates1')
+        renderer.add_global('greeting', lambda: 'Hello')
+        self.assertEqual(renderer.render('with_global.html'), '<h1>Hello</h1>')
+        renderer.add_global('greeting', lambda: 'Hi')
+        self.assertEqual(renderer.render('with_global.html'), '<h1>Hi</h1>')
+
+    def test_dependencies_tell_whether_extended_templates_are_up_to_date(self):
+        renderer = TemplateRenderer()
+        renderer.add_directory('tests/test_template_renderer/resources/templates1')
+        dependencies = renderer.dependencies('simple.html')
+        self.assertEqual(len(dependencies), 1)
+        self.assertTrue(dependencies[0]())
+
+    def test_environment_uses_configured_cache_size_and_auto_reload(self):
+        renderer = TemplateRenderer(cache_size=1000, auto_reload=False)
+        renderer._set_env_once()
+        self.assertEqual(renderer.jinja_env.cache.capacity, 1000)
+        self.assertFalse(renderer.jinja_env.auto_reload)
+
+    def test_renderer_without_auto_reload_keeps_compiled_templates(self):
+        with TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'page.html')
+            with open(path, 'w') as f:
+                f.write('<h1>old</h1>')
+            renderer = TemplateRenderer(auto_reload=False)
+            renderer.add_directory(directory)
+            self.assertEqual(renderer.render('page.html'), '<h1>old</h1>')
+            with open(path, 'w') as f:
+                f.write('<h1>new</h1>')
+            os.utime(path, (0, 0))
+            self.assertEqual(renderer.render('page.html'), '<h1>old</h1>')
+
+    def test_renderer_stores_compiled_templates_in_filesystem_bytecode_cache(self):
+        with TemporaryDirectory() as directory:
+            renderer = TemplateRenderer(bytecode_cache='filesystem', bytecode_cache_directory=directory)
+            renderer.add_directory('tests/test_template_renderer/resources/templates1')
+            self.assertEqual(renderer.render('simple.html'), '<h1>Simple</h1>')
+            self.assertEqual(len(os.listdir(directory)), 1)
+            renderer = TemplateRenderer(bytecode_cache='filesystem', bytecode_cache_directory=directory)
+            renderer.add_directory('tests/test_template_renderer/resources/templates1')
+            with patch('jinja2.environment.Environment._compile') as compile:
+                self.assertEqual(renderer.render('simple.html'), '<h1>Simple</h1>')
+            self.assertFalse(compile.called)
+
+    def test_renderer_can_use_memory_bytecode_cache(self):
+        renderer = TemplateRenderer(bytecode_cache='memory', cache_size=0)
+        renderer.add_directory('tests/test_template_renderer/resources/templates1')
+        self.assertEqual(renderer.render('simple.html'), '<h1>Simple</h1>')
+        with patch('jinja2.environment.Environment._compile') as compile:
+            self.assertEqual(renderer.render('simple.html'), '<h1>Simple</h1>')
+        self.assertFalse(compile.called)
+
+    def test_memory_bytecode_store_drops_least_recently_used_bytecode(self):
+        store = MemoryBytecodeStore(size=2)
+        store.set('a', b'1')
+        store.set('b', b'2')
+        store.get('a')
+        store.set('c', b'3')
+        self.assertEqual(len(store), 2)
+        self.assertIsNone(store.get('b'))
+        self.assertEqual(store.get('a'), b'1')
+
+    def test_renderer_accepts_bytecode_cache_instances(self):
+        bytecode_cache = FileSystemBytecodeCache()
+        renderer = TemplateRenderer(bytecode_cache=bytecode_cache)
+        renderer._set_env_once()
+        self.assertIs(renderer.jinja_env.bytecode_cache, bytecode_cache)
+
+    def test_renderer_rejects_unknown_bytecode_cache(self):
+        renderer = TemplateRenderer(bytecode_cache='redis')
+        with self.assertRaises(UnknownBytecodeCache):
+            renderer.render('simple.html')
+
+    def test_warmup_compiles_templates_of_directories_and_packages(self):
+        renderer = TemplateRenderer()
+        renderer.add_directory('tests/test_template_renderer/resources/templates2')
+        renderer.add_package('tests.test_template_renderer.resources.package1')
+        compile_times = renderer.warmup()
+        self.assertEqual(sorted(compile_times), [
+            'simple.html',
+            'simple2.html',
+            'tests.test_template_renderer.resources.package1/simple.html',
+        ])
+        self.assertTrue(all(seconds >= 0 for seconds in compile_times.values()))
+
+    def test_warmup_skips_files_that_are_not_html_templates(self):
+        with TemporaryDirectory() as directory:
+            with open(os.path.join(directory, 'about.html'), 'w') as f:
+                f.write('<h1>About</h1>')
+            with open(os.path.join(directory, 'logo.png'), 'wb') as f:
+                f.write(b'\x89PNG\r\n\x1a\n\xff')
+            renderer = TemplateRenderer()
+            renderer.add_directory(directory)
+            self.assertEqual(list(renderer.warmup()), ['about.html'])
+
+    def test_templates_are_not_compiled_again_after_warmup(self):
+        renderer = TemplateRenderer()
+        renderer.add_directory('tests/test_template_renderer/resources/templates1')
+        renderer.warmup()
+        with patch('jinja2.environment.Environment._compile') as compile:
+            self.assertEqual(renderer.render('subdirectory/simple.html'), '<h1>Simple</h1>')
+        self.assertFalse(compile.called)
+
+    def test_stream_yields_rendered_template_in_encoded_chunks(self):
+        renderer = TemplateRenderer()
+        renderer.add_directory('tests/test_template_renderer/resources/templates1')
+        chunks = list(renderer.stream('with_context.html', {'name': 'John'}))
+        self.assertEqual(b''.join(chunks), b'<h1>Hello John</h1>')
+
+    def test_stream_buffers_chunks_up_to_buffer_size(self):
+        with TemporaryDirectory() as directory:
+            with open(os.path.join(directory, 'rows.html'), 'w') as f:
+                f.write('{% for row in rows %}<p>{{ row }}</p>{% endfor %}')
+            renderer = TemplateRenderer()
+            renderer.add_directory(directory)
+            chunks = list(renderer.stream('rows.html', {'rows': range(100)}, buffer_size=64))
+            self.assertEqual(b''.join(chunks), ''.join('<p>{}</p>'.format(row) for row in range(100)).encode('utf-8'))
+            self.assertGreater(len(chunks), 1)
+            self.assertTrue(all(64 <= len(chunk) < 64 + 16 for chunk in chunks[:-1]))
+
+    def test_stream_looks_up_template_right_away(self):
+        renderer = TemplateRenderer()
+        renderer.add_directory('tests/test_template_renderer/resources/templates1')
+        with self.assertRaises(TemplateNotFound):
+            renderer.stream('missing.html')
+
+    def make_fragment_renderer(self, directory, source, fragment_cache=None):
+        with open(os.path.join(directory, 'fragment.html'), 'w') as f:
+            f.write(source)
+        renderer = TemplateRenderer(fragment_cache=fragment_cache)
+        renderer.add_directory(directory)
+        return renderer
+
+    def test_cache_tag_renders_block_once_per_key(self):
+        with TemporaryDirectory() as directory:
+            source = '{% cache "nav-" ~ user, 60 %}<nav>{{ count }}</nav>{% endcache %}<p>{{ count }}</p>'
+            renderer = self.make_fragment_renderer(directory, source)
+            self.assertEqual(renderer.render('fragment.html', {'user': 1, 'count': 1}), '<nav>1</nav><p>1</p>')
+            self.assertEqual(renderer.render('fragment.html', {'user': 1, 'count': 2}), '<nav>1</nav><p>2</p>')
+            self.assertEqual(renderer.render('fragment.html', {'user': 2, 'count': 3}), '<nav>3</nav><p>3</p>')
+            self.assertEqual((renderer.fragment_cache.hits, renderer.fragment_cache.misses), (1, 2))
+
+    def test_cache_tag_does_not_escape_cached_html_again(self):
+        with TemporaryDirectory() as directory:
+            source = '{% cache "name" %}<b>{{ name }}</b>{% endcache %}'
+            renderer = self.make_fragment_renderer(directory, source)
+            self.assertEqual(renderer.render('fragment.html', {'name': '<i>'}), '<b>&lt;i&gt;</b>')
+            self.assertEqual(renderer.render('fragment.html', {'name': 'x'}), '<b>&lt;i&gt;</b>')
+
+    def test_cache_tag_uses_configured_store(self):
+        with TemporaryDirectory() as directory, TemporaryDirectory() as cache_directory:
+            source = '{% cache "nav", 60 %}<nav>{{ count }}</nav>{% endcache %}'
+            renderer1 = self.make_fragment_renderer(directory, source, FragmentCache(FileFragmentStore(cache_directory)))
+            renderer2 = self.make_fragment_renderer(directory, source, FragmentCache(FileFragmentStore(cache_directory)))
+            self.assertEqual(renderer1.render('fragment.html', {'count': 1}), '<nav>1</nav>')
+            self.assertEqual(renderer2.render('fragment.html', {'count': 2}), '<nav>1</nav>')